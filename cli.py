@@ -16,9 +16,6 @@ Usage:
 """
 
 import os
-import re
-import smtplib
-import subprocess
 import sys
 from pathlib import Path
 from typing import Optional
@@ -29,6 +26,7 @@ import click
 PROJECT_ROOT = Path(__file__).parent.resolve()
 DEFAULT_CONFIG = Path.home() / ".config" / "swr" / "config.yaml"
 CRON_MARKER = "# swr:stock-weekly-report"
+_MISSING = object()
 
 
 # ─── Internal helpers ────────────────────────────────────────────────────────
@@ -45,51 +43,52 @@ def _save_cfg(config_path: Path, data: dict) -> None:
     save_config(config_path, data)
 
 
+# Crontab contents as last read or written by this process, so one command
+# (e.g. `cron install` → _install_cron_job) only shells out to `crontab -l` once.
+_CRONTAB_CACHE: Optional[list[str]] = None
+
+
 def _get_crontab() -> list[str]:
-    result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
-    if result.returncode != 0:
-        return []
-    return result.stdout.splitlines()
+    global _CRONTAB_CACHE
+    import subprocess
+    if _CRONTAB_CACHE is None:
+        result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
+        _CRONTAB_CACHE = result.stdout.splitlines() if result.returncode == 0 else []
+    # Callers edit the list in place; hand out a copy so the cache only
+    # changes through _set_crontab.
+    return list(_CRONTAB_CACHE)
 
 
 def _set_crontab(lines: list[str]) -> None:
-    content = "\n".join(lines)
-    if content and not content.endswith("\n"):
-        content += "\n"
+    global _CRONTAB_CACHE
+    import subprocess
+    content = "".join(f"{line}\n" for line in lines)
     subprocess.run(["crontab", "-"], input=content, text=True, check=True)
+    _CRONTAB_CACHE = list(lines)
 
 
 def _find_swr_cron_idx(lines: list[str]) -> Optional[int]:
-    for i, line in enumerate(lines):
-        if CRON_MARKER in line:
-            return i
-    return None
+    return next((i for i, line in enumerate(lines) if CRON_MARKER in line), None)
 
 
 def _write_zprofile_var(var_name: str, value: str) -> None:
     """Write or update an export line in ~/.zprofile."""
+    import re
     zprofile = Path.home() / ".zprofile"
     new_line = f'export {var_name}="{value}"'
-    pattern = re.compile(rf"^export\s+{re.escape(var_name)}\s*=")
-
-    if zprofile.exists():
-        lines = zprofile.read_text(encoding="utf-8").splitlines(keepends=True)
-        for i, line in enumerate(lines):
-            if pattern.match(line):
-                lines[i] = new_line + "\n"
-                zprofile.write_text("".join(lines), encoding="utf-8")
-                return
-        content = "".join(lines)
-    else:
-        content = ""
-
-    if content and not content.endswith("\n"):
-        content += "\n"
-    content += new_line + "\n"
+    # [ \t] rather than \s, which would let a match run across a line break
+    pattern = re.compile(rf"^export[ \t]+{re.escape(var_name)}[ \t]*=.*$", re.MULTILINE)
+
+    content = zprofile.read_text(encoding="utf-8") if zprofile.exists() else ""
+    # Callable replacement so backslashes in the value are not treated as escapes
+    content, count = pattern.subn(lambda _: new_line, content, count=1)
+    if not count:
+        if content and not content.endswith("\n"):
+            content += "\n"
+        content += new_line + "\n"
     zprofile.write_text(content, encoding="utf-8")
 
 
-
 def _install_cron_job(schedule: str) -> None:
     run_sh = PROJECT_ROOT / "run.sh"
     lines = _get_crontab()
@@ -125,6 +124,8 @@ def main(ctx, config):
 @click.pass_context
 def init(ctx):
     """Interactive first-time setup wizard."""
+    import smtplib
+    import subprocess
     config_path = ctx.obj["config"]
     cfg = _load_cfg(config_path)
 
@@ -133,6 +134,7 @@ def init(ctx):
     # 0. Project root (where pipeline.py and venv/ live)
     cwd = Path.cwd()
     saved_root = cfg.get("project_root", "")
+    suggestion_has_pipeline = True
     if (cwd / "pipeline.py").exists():
         suggested_root = str(cwd)
     elif saved_root and (Path(saved_root) / "pipeline.py").exists():
@@ -141,9 +143,15 @@ def init(ctx):
         suggested_root = str(PROJECT_ROOT)
     else:
         suggested_root = saved_root or ""
+        suggestion_has_pipeline = False
     project_root_input = click.prompt("Project root [required]", default=suggested_root)
     project_root_path = Path(project_root_input).expanduser().resolve()
-    if not (project_root_path / "pipeline.py").exists():
+    # Accepting the suggestion means pipeline.py was already found there
+    if project_root_input == suggested_root:
+        has_pipeline = suggestion_has_pipeline
+    else:
+        has_pipeline = (project_root_path / "pipeline.py").exists()
+    if not has_pipeline:
         click.echo(f"  ! pipeline.py not found in {project_root_path} — fix this before running the pipeline")
     else:
         click.echo(f"  ✓ pipeline.py found at {project_root_path}")
@@ -153,8 +161,9 @@ def init(ctx):
     parent_folder = click.prompt("Data folder path [required]", default=default_folder)
 
     # 2. nlm — installed automatically by postinstall; check auth status
-    nlm_path_expanded = cfg.get("nlm_path", "")
-    if nlm_path_expanded and Path(nlm_path_expanded).exists():
+    # Expand ~ once but keep the literal path otherwise (no resolve())
+    nlm_path_expanded = os.path.expanduser(cfg.get("nlm_path", ""))
+    if nlm_path_expanded and os.path.exists(nlm_path_expanded):
         click.echo(f"  ✓ nlm found at {nlm_path_expanded}")
         auth_ok = subprocess.run(
             [nlm_path_expanded, "login", "--check"],
@@ -304,7 +313,26 @@ def run_cmd(ctx, skip_fetch, skip_transcribe, skip_upload, skip_email, skip_clea
     python_bin = project_root / "venv" / "bin" / "python3"
     pipeline_py = project_root / "pipeline.py"
 
-    if not python_bin.exists():
+    cmd = [str(python_bin), str(pipeline_py), "--config", str(config_path)]
+    if skip_fetch:       cmd.append("--skip-fetch")
+    if skip_transcribe:  cmd.append("--skip-transcribe")
+    if skip_upload:      cmd.append("--skip-upload")
+    if skip_email:       cmd.append("--skip-email")
+    if skip_cleanup:     cmd.append("--skip-cleanup")
+    if save_report_only: cmd.append("--save-report-only")
+    if folder:           cmd += ["--folder", folder]
+    if notebook_id:      cmd += ["--notebook-id", notebook_id]
+
+    # Replace this process with the pipeline — nothing runs after it, so there
+    # is no reason to keep the CLI interpreter resident waiting on a child.
+    # A missing venv surfaces as FileNotFoundError from execv itself, so there
+    # is no separate existence check up front.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.chdir(project_root)
+        os.execv(str(python_bin), cmd)
+    except FileNotFoundError:
         click.echo(f"Error: Pipeline Python not found at {python_bin}", err=True)
         if not cfg.get("project_root"):
             click.echo(
@@ -319,19 +347,6 @@ def run_cmd(ctx, skip_fetch, skip_transcribe, skip_upload, skip_email, skip_clea
             )
         sys.exit(1)
 
-    cmd = [str(python_bin), str(pipeline_py), "--config", str(config_path)]
-    if skip_fetch:       cmd.append("--skip-fetch")
-    if skip_transcribe:  cmd.append("--skip-transcribe")
-    if skip_upload:      cmd.append("--skip-upload")
-    if skip_email:       cmd.append("--skip-email")
-    if skip_cleanup:     cmd.append("--skip-cleanup")
-    if save_report_only: cmd.append("--save-report-only")
-    if folder:           cmd += ["--folder", folder]
-    if notebook_id:      cmd += ["--notebook-id", notebook_id]
-
-    result = subprocess.run(cmd, cwd=str(project_root))
-    sys.exit(result.returncode)
-
 
 # ─── podcast ──────────────────────────────────────────────────────────────────
 
@@ -364,10 +379,9 @@ def podcast_add(ctx, name, url):
     config_path = ctx.obj["config"]
     cfg = _load_cfg(config_path)
     feeds = cfg.setdefault("feeds", [])
-    for feed in feeds:
-        if feed["name"] == name:
-            click.echo(f"Feed '{name}' already exists.")
-            return
+    if name in {feed["name"] for feed in feeds}:
+        click.echo(f"Feed '{name}' already exists.")
+        return
     feeds.append({"name": name, "url": url})
     _save_cfg(config_path, cfg)
     click.echo(f"Added: {name}")
@@ -422,7 +436,7 @@ def receiver_add(ctx, email_addr):
     email_cfg = cfg.setdefault("email", {})
     to = email_cfg.get("to", "")
     recipients = to if isinstance(to, list) else ([to] if to else [])
-    if email_addr in recipients:
+    if email_addr in set(recipients):
         click.echo(f"'{email_addr}' is already in the recipient list.")
         return
     recipients.append(email_addr)
@@ -528,13 +542,13 @@ def config_show(ctx):
         click.echo(f"Config file not found: {config_path}")
         click.echo("Run 'swr init' to create it.")
         return
-    from config_manager import load_config
+    from config_manager import SafeDumper, load_config
     import yaml
     cfg = load_config(config_path)
     # Redact smtp_password
     if cfg.get("email", {}).get("smtp_password"):
         cfg["email"]["smtp_password"] = "***"
-    click.echo(yaml.dump(cfg, allow_unicode=True, default_flow_style=False, sort_keys=False))
+    click.echo(yaml.dump(cfg, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False, sort_keys=False))
 
 
 @config_cmd.command("set")
@@ -551,15 +565,21 @@ def config_set(ctx, key, value):
         obj = obj.setdefault(part, {})
     leaf = parts[-1]
     if value.lower() in ("true", "false"):
-        obj[leaf] = value.lower() == "true"
+        new_value = value.lower() == "true"
     else:
         try:
-            obj[leaf] = int(value)
+            new_value = int(value)
         except ValueError:
             try:
-                obj[leaf] = float(value)
+                new_value = float(value)
             except ValueError:
-                obj[leaf] = value
+                new_value = value
+    # Compare types too, so e.g. `1` → `true` is still treated as a change
+    old_value = obj.get(leaf, _MISSING)
+    if type(old_value) is type(new_value) and old_value == new_value:
+        click.echo(f"{key} is already {new_value} (unchanged)")
+        return
+    obj[leaf] = new_value
     _save_cfg(config_path, cfg)
     click.echo(f"Set {key} = {obj[leaf]}")
 
@@ -570,12 +590,16 @@ def config_set(ctx, key, value):
 @click.pass_context
 def nlm_login_cmd(ctx):
     """Log in to NotebookLM (browser OAuth). Run once, or again if auth expires."""
+    import subprocess
     cfg = _load_cfg(ctx.obj["config"])
     nlm_path = cfg.get("nlm_path", "")
-    if not nlm_path or not Path(nlm_path).exists():
+    try:
+        if not nlm_path:
+            raise FileNotFoundError(nlm_path)
+        auth_ok = subprocess.run([nlm_path, "login", "--check"], capture_output=True).returncode == 0
+    except FileNotFoundError:
         click.echo("Error: nlm not found. Set it with: swr config set nlm_path /path/to/nlm", err=True)
         sys.exit(1)
-    auth_ok = subprocess.run([nlm_path, "login", "--check"], capture_output=True).returncode == 0
     if auth_ok:
         click.echo("Already authenticated. Use --force to re-login.")
         if not click.confirm("Re-login anyway?", default=False):
@@ -3,28 +3,135 @@ from __future__ import annotations
 config_manager.py
 
 Safe atomic helpers for reading and writing config.yaml.
-Used by cli.py (podcast/receiver/config commands) and mcp_server.py.
+Used by cli.py (podcast/receiver/config commands), mcp_server.py and
+pipeline.py.
+
+The parsed config is cached next to the YAML file as
+``config.yaml.cache.pkl``, keyed by the YAML file's mtime, size and inode, so
+repeated CLI invocations skip YAML parsing until the file changes.
+Long-lived processes (the MCP server) additionally keep the pickled bytes
+in a small in-memory LRU, so a warm load is one stat() plus an unpickle.
+Every call returns a fresh dict, so callers may mutate it freely.
 """
 
 import os
+import pickle
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+    HAS_LIBYAML = False
+
+
+def _cache_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache.pkl")
+
+
+_StatKey = tuple[int, int, int]
+
+
+def _stat_key(path: Path) -> _StatKey:
+    # st_ino catches an editor's atomic save-by-rename that happens to keep
+    # the same size within the filesystem's mtime granularity.
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+# abspath → (stat key, pickled (key, data) blob); the blob is the same bytes
+# stored in the on-disk cache file.
+_MEM_CACHE: OrderedDict[str, tuple[_StatKey, bytes]] = OrderedDict()
+_MEM_CACHE_SIZE = 16
+
+
+def _remember(path: Path, key: _StatKey, blob: bytes) -> None:
+    abspath = os.path.abspath(path)
+    _MEM_CACHE[abspath] = (key, blob)
+    _MEM_CACHE.move_to_end(abspath)
+    while len(_MEM_CACHE) > _MEM_CACHE_SIZE:
+        _MEM_CACHE.popitem(last=False)
+
+
+def _write_cache(path: Path, key: _StatKey, data: dict) -> None:
+    """Atomically write (key, data) to the pickle cache; write failures are ignored."""
+    blob = pickle.dumps((key, data), protocol=pickle.HIGHEST_PROTOCOL)
+    _remember(path, key, blob)
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="wb", dir=path.parent, delete=False, suffix=".tmp"
+        ) as tf:
+            tf.write(blob)
+            tmp_path = tf.name
+        os.replace(tmp_path, _cache_path(path))
+    except OSError:
+        pass
+
 
 def load_config(path: str | Path) -> dict:
+    path = Path(path)
+    key = _stat_key(path)
+
+    entry = _MEM_CACHE.get(os.path.abspath(path))
+    if entry is not None and entry[0] == key:
+        _MEM_CACHE.move_to_end(os.path.abspath(path))
+        return pickle.loads(entry[1])[1]
+
+    try:
+        blob = _cache_path(path).read_bytes()
+        cached_key, data = pickle.loads(blob)
+        if cached_key == key:
+            _remember(path, key, blob)
+            return data
+    except Exception:
+        pass  # missing, stale or unreadable cache — fall back to YAML
+
+    if not HAS_LIBYAML:
+        import warnings
+        warnings.warn(
+            "PyYAML was built without libyaml; parsing config with the slow "
+            "pure-Python loader. Reinstall PyYAML with libyaml for faster loads.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
     with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=SafeLoader) or {}
+    _write_cache(path, key, data)
+    return data
+
+
+def freeze_config(data: Any) -> Any:
+    """Return a read-only view of *data*: dicts become MappingProxyType, lists tuples.
+
+    Used by the pipeline so one config object can be handed to every stage
+    without copies, and no stage can mutate what the next one sees.
+    """
+    if isinstance(data, Mapping):
+        return MappingProxyType({k: freeze_config(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(freeze_config(v) for v in data)
+    return data
 
 
 def save_config(path: str | Path, data: dict) -> None:
     """Atomically write config to path via temp file + rename."""
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    # No fsync: os.replace is atomic at the directory-entry level, which is
+    # all a small, easily regenerated config file needs.
     with tempfile.NamedTemporaryFile(
-        mode="w", encoding="utf-8", dir=path.parent, delete=False, suffix=".tmp"
+        mode="w", encoding="utf-8", dir=path.parent, delete=False, suffix=".tmp",
+        buffering=1 << 16,
     ) as tf:
-        yaml.dump(data, tf, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        yaml.dump(data, tf, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        tf.flush()
         tmp_path = tf.name
     os.replace(tmp_path, path)
+    _write_cache(path, _stat_key(path), data)
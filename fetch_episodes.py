@@ -10,17 +10,26 @@ Output structure:
 
 Each speaker has a persistent folder. Downloads are skipped if the file
 already exists (checked by filename / date), so re-runs are safe.
+
+Feed bodies are cached under ~/.cache/swr/ together with their ETag /
+Last-Modified validators, so unchanged feeds come back as a bodiless
+304 Not Modified and are parsed from the cached copy.
 """
 
+import hashlib
+import json
 import os
+import re
 import sys
-import yaml
-import feedparser
-import requests
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from email.utils import parsedate_to_datetime
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Callable
+
+# feedparser and requests are imported inside the functions that use
+# them so importing this module (e.g. from pipeline.py) stays cheap.
+if TYPE_CHECKING:
+    import requests
 
 try:
     from tqdm import tqdm
@@ -28,14 +37,34 @@ try:
 except ImportError:
     HAS_TQDM = False
 
+# Episode downloads are network-bound, so a handful of parallel streams
+# over a shared keep-alive connection pool gives a near-linear speedup.
+DOWNLOAD_WORKERS = 8
+FEED_WORKERS = 8
+POOL_SIZE = 16
+
+# Read size for streaming downloads. Large chunks keep the Python-level
+# loop (and tqdm updates) to a few hundred iterations per episode; each
+# download reuses one buffer of this size rather than allocating per chunk.
+CHUNK_SIZE = 256 * 1024
+WRITE_BUFFER = 1024 * 1024
+
+# Audio extension at the end of a URL path (before any query/fragment).
+# Mirrors the extensions the transcribe stage picks up.
+_AUDIO_EXT_RE = re.compile(r"\.(mp3|m4a|ogg|aac|wav|flac|opus)(?:[?#]|$)", re.IGNORECASE)
+
+FEED_CACHE_DIR = Path.home() / ".cache" / "swr" / "feeds"
+FEED_STATE_FILE = FEED_CACHE_DIR.parent / "feed_state.json"
+
 
 # ---------------------------------------------------------------------------
 # Config & date helpers
 # ---------------------------------------------------------------------------
 
 def load_config(config_path: str = "config.yaml") -> dict:
-    with open(config_path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    # Shared with the pipeline, CLI and MCP server: C loader + parse cache
+    from config_manager import load_config as _load_config
+    return _load_config(config_path)
 
 
 def get_date_range(lookback_days: int):
@@ -55,9 +84,15 @@ def folder_name_for_range(start_date, end_date) -> str:
 
 def parse_pub_date(entry) -> "date | None":
     """Extract publication date from a feedparser entry, normalised to UTC date."""
+    # feedparser already parses the date into a UTC struct_time; use it directly
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if parsed:
+        return date(parsed.tm_year, parsed.tm_mon, parsed.tm_mday)
+
     raw = entry.get("published") or entry.get("updated")
     if not raw:
         return None
+    from email.utils import parsedate_to_datetime
     try:
         dt = parsedate_to_datetime(raw)
         # Convert to UTC if timezone-aware
@@ -80,59 +115,157 @@ def extract_audio_url(entry) -> "str | None":
         if link.get("rel") == "enclosure":
             url = link.get("href", "")
             mime = link.get("type", "")
-            if "audio" in mime or url.lower().endswith((".mp3", ".m4a", ".ogg", ".aac")):
+            if "audio" in mime or _AUDIO_EXT_RE.search(url):
                 return url
 
     return None
 
 
+def _load_feed_state() -> dict:
+    try:
+        return json.loads(FEED_STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_feed_state(state: dict) -> None:
+    try:
+        FEED_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = FEED_STATE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp, FEED_STATE_FILE)
+    except OSError as exc:
+        print(f"  WARNING: could not save feed cache state: {exc}")
+
+
+def _feed_body_path(url: str) -> Path:
+    return FEED_CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.xml"
+
+
+def fetch_feeds(session: requests.Session, urls: list[str]) -> dict[str, "bytes | Exception"]:
+    """GET every feed URL in parallel and return {url: body bytes or the raised error}.
+
+    Uses conditional GET (If-None-Match / If-Modified-Since) against the
+    validators saved on the previous run; a 304 reply is served from the
+    cached body on disk.
+    """
+    state = _load_feed_state()
+
+    def _get(url: str) -> tuple[bytes, dict | None]:
+        body_path = _feed_body_path(url)
+        validators = state.get(url, {})
+        headers = {}
+        if body_path.exists():
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("modified"):
+                headers["If-Modified-Since"] = validators["modified"]
+
+        response = session.get(url, headers=headers, timeout=60)
+        if response.status_code == 304:
+            return body_path.read_bytes(), None
+        response.raise_for_status()
+        body = response.content
+
+        etag = response.headers.get("ETag")
+        modified = response.headers.get("Last-Modified")
+        if not (etag or modified):
+            return body, None
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        body_path.write_bytes(body)
+        return body, {"etag": etag, "modified": modified}
+
+    bodies: dict[str, bytes | Exception] = {}
+    if not urls:
+        return bodies
+    updated = False
+    with ThreadPoolExecutor(max_workers=min(FEED_WORKERS, len(urls))) as pool:
+        futures = {pool.submit(_get, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                bodies[url], validators = future.result()
+            except Exception as exc:
+                bodies[url] = exc
+                continue
+            if validators is not None:
+                state[url] = validators
+                updated = True
+    if updated:
+        _save_feed_state(state)
+    return bodies
+
+
 def url_extension(url: str) -> str:
-    """Return file extension from URL path, defaulting to .mp3."""
-    path = urlparse(url).path
-    ext = os.path.splitext(path)[1]
-    return ext if ext else ".mp3"
+    """Return the audio file extension from a URL, defaulting to .mp3."""
+    m = _AUDIO_EXT_RE.search(url)
+    return f".{m.group(1).lower()}" if m else ".mp3"
 
 
 # ---------------------------------------------------------------------------
 # Download helper
 # ---------------------------------------------------------------------------
 
-def download_file(url: str, dest: Path) -> None:
-    """Stream-download *url* into *dest*, with an optional tqdm progress bar."""
-    response = requests.get(url, stream=True, timeout=60)
-    response.raise_for_status()
+def make_session() -> requests.Session:
+    """Return a Session whose connection pool is large enough for DOWNLOAD_WORKERS."""
+    import requests
+    from requests.adapters import HTTPAdapter
 
-    total = int(response.headers.get("content-length", 0))
-    chunk_size = 8192
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-    if HAS_TQDM and total:
-        bar = tqdm(total=total, unit="B", unit_scale=True, desc=dest.name, leave=False)
-    else:
-        bar = None
 
-    with open(dest, "wb") as fh:
-        for chunk in response.iter_content(chunk_size=chunk_size):
-            fh.write(chunk)
-            if bar:
-                bar.update(len(chunk))
+def download_file(session: requests.Session, url: str, dest: Path, bar=None) -> None:
+    """Stream-download *url* into *dest*, updating the shared tqdm *bar* if given.
 
-    if bar:
-        bar.close()
+    The body goes to a sibling .part file that replaces *dest* only once the
+    download completes, so a failed download never touches an existing file.
+    """
+    tmp = dest.with_name(dest.name + ".part")
+    try:
+        with session.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            raw = response.raw
+            raw.decode_content = True
+            view = memoryview(bytearray(CHUNK_SIZE))
+            with open(tmp, "wb", buffering=WRITE_BUFFER) as fh:
+                while True:
+                    n = raw.readinto(view)
+                    if not n:
+                        break
+                    fh.write(view[:n])
+                    if bar is not None:
+                        bar.update(n)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 # ---------------------------------------------------------------------------
 # Main pipeline
 # ---------------------------------------------------------------------------
 
-def fetch_and_download(config: dict, folder_name: str | None = None) -> None:
+def fetch_and_download(
+    config: dict,
+    folder_name: str | None = None,
+    on_file_complete: Callable[[Path], None] | None = None,
+) -> None:
     """Fetch RSS feeds and download new episodes into the run folder.
 
     Parameters
     ----------
-    config:      Parsed config dict.
-    folder_name: Pre-computed run folder (e.g. '20260218-20260225').
-                 If None, it is derived from config['lookback_days'].
+    config:           Parsed config dict.
+    folder_name:      Pre-computed run folder (e.g. '20260218-20260225').
+                      If None, it is derived from config['lookback_days'].
+    on_file_complete: Optional callback invoked with each destination path
+                      as soon as its download finishes successfully.
     """
+    import feedparser
+
     lookback_days = int(config.get("lookback_days", 7))
     start_date, end_date = get_date_range(lookback_days)
 
@@ -142,7 +275,6 @@ def fetch_and_download(config: dict, folder_name: str | None = None) -> None:
         run_folder = folder_name
         # Parse dates back from the folder name for the range check
         parts = folder_name.split("-")
-        from datetime import date
         start_date = date(int(parts[0][:4]), int(parts[0][4:6]), int(parts[0][6:8]))
         end_date   = date(int(parts[1][:4]), int(parts[1][4:6]), int(parts[1][6:8]))
 
@@ -153,17 +285,30 @@ def fetch_and_download(config: dict, folder_name: str | None = None) -> None:
     print(f"Audio root  : {audio_root}")
     print()
 
-    total_downloaded = 0
+    session = make_session()
+    # dest -> URL. Two episodes of one feed on the same day share a filename;
+    # like the old serial loop, the later entry wins, and no two downloads
+    # ever write the same file at once.
+    downloads: dict[Path, str] = {}
 
-    for feed_cfg in config.get("feeds", []):
+    feeds = config.get("feeds", [])
+    print(f"Fetching {len(feeds)} feed(s) …")
+    bodies = fetch_feeds(session, [feed_cfg["url"] for feed_cfg in feeds])
+    print()
+
+    for feed_cfg in feeds:
         program_name = feed_cfg["name"]
         feed_url = feed_cfg["url"]
 
         speaker_dir = audio_root / program_name
         speaker_dir.mkdir(parents=True, exist_ok=True)
 
-        print(f"[{program_name}] Fetching feed …")
-        parsed = feedparser.parse(feed_url)
+        print(f"[{program_name}] Parsing feed …")
+        body = bodies[feed_url]
+        if isinstance(body, Exception):
+            print(f"  WARNING: could not fetch feed ({feed_url}): {body}")
+            continue
+        parsed = feedparser.parse(body)
 
         if parsed.bozo and not parsed.entries:
             print(f"  WARNING: could not parse feed ({feed_url})")
@@ -187,22 +332,43 @@ def fetch_and_download(config: dict, folder_name: str | None = None) -> None:
             filename = f"{program_name}_{date_str}{ext}"
             dest = speaker_dir / filename
 
-            print(f"  Downloading: {filename}")
-            try:
-                download_file(audio_url, dest)
-                print(f"  Saved      : {dest}")
-                found += 1
-                total_downloaded += 1
-            except Exception as exc:
-                print(f"  ERROR downloading {filename}: {exc}")
-                # Remove partial file if it exists
-                if dest.exists():
-                    dest.unlink()
+            print(f"  Queued     : {filename}")
+            downloads[dest] = audio_url
+            found += 1
 
         if found == 0:
             print(f"  No new episodes in the past {lookback_days} days.")
         print()
 
+    total_downloaded = 0
+    if downloads:
+        print(f"Downloading {len(downloads)} file(s) "
+              f"({min(DOWNLOAD_WORKERS, len(downloads))} parallel) …")
+        bar = tqdm(unit="B", unit_scale=True, desc="Downloading", leave=False) if HAS_TQDM else None
+        log = bar.write if bar is not None else print
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            futures = {
+                pool.submit(download_file, session, url, dest, bar): dest
+                for dest, url in downloads.items()
+            }
+            for future in as_completed(futures):
+                dest = futures[future]
+                try:
+                    future.result()
+                    log(f"  Saved      : {dest}")
+                    total_downloaded += 1
+                    if on_file_complete is not None:
+                        on_file_complete(dest)
+                except Exception as exc:
+                    # download_file already removed its partial .part file
+                    log(f"  ERROR downloading {dest.name}: {exc}")
+
+        if bar is not None:
+            bar.close()
+        print()
+
+    session.close()
     print(f"Done. {total_downloaded} file(s) newly downloaded → {audio_root}")
 
 
@@ -5,34 +5,72 @@ mcp_server.py
 MCP server for the stock-weekly-report pipeline.
 Exposes four tools: run_pipeline, get_report, list_reports, get_logs.
 
+The tools are plain functions registered on a FastMCP instance in main(),
+so importing this module does not import the mcp package.
+
 Start with:
   swr mcp          (via the CLI)
   python mcp_server.py
   venv14/bin/swr-mcp
 """
 
+import os
 import subprocess
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
-import yaml
-from mcp.server.fastmcp import FastMCP
-
 PROJECT_ROOT = Path(__file__).parent.resolve()
 DEFAULT_CONFIG = PROJECT_ROOT / "config.yaml"
 
-mcp = FastMCP("stock-weekly-report")
+# run_pipeline returns at most this many trailing lines of run.sh output.
+RUN_OUTPUT_LINES = 2000
 
 
 def _load_config(config_path: Optional[str] = None) -> dict:
-    path = Path(config_path) if config_path else DEFAULT_CONFIG
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    from config_manager import load_config
+    return load_config(Path(config_path) if config_path else DEFAULT_CONFIG)
+
+
+def _tail(path: Path, n: int, block_size: int = 8192) -> str:
+    """Return the last *n* lines of *path*, reading backwards in blocks."""
+    with path.open("rb") as f:
+        pos = f.seek(0, 2)
+        buf = b""
+        # n + 1 newlines guarantee n complete lines even with a trailing newline
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    return b"\n".join(buf.splitlines()[-n:]).decode("utf-8", errors="replace")
+
+
+# ((reports dir, its st_mtime_ns), folder names newest first). Adding or
+# removing a week folder bumps the directory's mtime and invalidates it.
+_LISTING_CACHE: Optional[tuple[tuple[str, int], tuple[str, ...]]] = None
+
+
+def _report_folders(reports_dir: Path) -> tuple[str, ...]:
+    """Return report folder names, newest first; rescanned only when the directory changes."""
+    global _LISTING_CACHE
+    key = (str(reports_dir), reports_dir.stat().st_mtime_ns)
+    if _LISTING_CACHE is not None and _LISTING_CACHE[0] == key:
+        return _LISTING_CACHE[1]
+    with os.scandir(reports_dir) as it:
+        folders = tuple(sorted((e.name for e in it if e.is_dir()), reverse=True))
+    _LISTING_CACHE = (key, folders)
+    return folders
+
+
+def _latest_folder(reports_dir: Path) -> Optional[str]:
+    """Return the newest report folder name, or None."""
+    folders = _report_folders(reports_dir)
+    return folders[0] if folders else None
 
 
 # ─── Tools ───────────────────────────────────────────────────────────────────
 
-@mcp.tool()
 def run_pipeline(
     stages: Optional[list[str]] = None,
     folder: Optional[str] = None,
@@ -68,20 +106,25 @@ def run_pipeline(
         for s in all_stages - set(stages):
             cmd.append(f"--skip-{s}")
 
-    result = subprocess.run(
-        cmd, capture_output=True, text=True, cwd=str(PROJECT_ROOT)
+    # Stream the merged stdout/stderr line by line and keep only the tail, so
+    # a long run never holds its whole output in memory; the full log is
+    # still available through get_logs.
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, bufsize=1, cwd=str(PROJECT_ROOT),
     )
+    out: deque[str] = deque(maxlen=RUN_OUTPUT_LINES)
+    total = 0
+    with proc.stdout:
+        for line in proc.stdout:
+            out.append(line)
+            total += 1
+    proc.wait()
 
-    parts = []
-    if result.stdout:
-        parts.append(result.stdout)
-    if result.stderr:
-        parts.append(f"STDERR:\n{result.stderr}")
-    parts.append(f"\nExit code: {result.returncode}")
-    return "\n".join(parts)
+    header = f"... [{total - len(out)} earlier line(s) omitted]\n" if total > len(out) else ""
+    return f"{header}{''.join(out)}\nExit code: {proc.returncode}"
 
 
-@mcp.tool()
 def list_reports() -> str:
     """List all available weekly report folders."""
     cfg = _load_config()
@@ -89,10 +132,7 @@ def list_reports() -> str:
     if not reports_dir.exists():
         return "No reports directory found."
 
-    folders = sorted(
-        [d.name for d in reports_dir.iterdir() if d.is_dir()],
-        reverse=True,
-    )
+    folders = _report_folders(reports_dir)
     if not folders:
         return "No reports found."
 
@@ -104,35 +144,41 @@ def list_reports() -> str:
     return "\n".join(lines)
 
 
-@mcp.tool()
-def get_report(folder: Optional[str] = None) -> str:
+def get_report(folder: Optional[str] = None, max_bytes: int = 262144) -> str:
     """Get the content of a weekly report.
 
     Args:
         folder: Report folder name, e.g. '20260218-20260225'. Defaults to the latest.
+        max_bytes: Return at most this many bytes from the end of the report
+                   (default 256 KiB). Longer reports are truncated at the start.
+                   Must be positive.
     """
+    if max_bytes <= 0:
+        return f"max_bytes must be a positive number of bytes, got {max_bytes}."
     cfg = _load_config()
     reports_dir = Path(cfg.get("parent_folder", "")) / "reports"
 
     if folder is None:
         if not reports_dir.exists():
             return "No reports directory found."
-        folders = sorted(
-            [d.name for d in reports_dir.iterdir() if d.is_dir()],
-            reverse=True,
-        )
-        if not folders:
+        folder = _latest_folder(reports_dir)
+        if folder is None:
             return "No reports found."
-        folder = folders[0]
 
     report_path = reports_dir / folder / "weekly_report.txt"
-    if not report_path.exists():
+    try:
+        size = report_path.stat().st_size
+    except FileNotFoundError:
         return f"Report not found: {report_path}"
 
-    return report_path.read_text(encoding="utf-8")
+    if size <= max_bytes:
+        return report_path.read_text(encoding="utf-8")
+    with report_path.open("rb") as f:
+        f.seek(size - max_bytes)
+        tail = f.read().decode("utf-8", errors="replace")
+    return f"... [truncated — showing last {max_bytes:,} of {size:,} bytes]\n{tail}"
 
 
-@mcp.tool()
 def get_logs(lines: int = 100) -> str:
     """Get the last N lines of the pipeline log.
 
@@ -143,14 +189,23 @@ def get_logs(lines: int = 100) -> str:
     if not log_path.exists():
         return "No pipeline.log found."
 
-    all_lines = log_path.read_text(encoding="utf-8").splitlines()
-    tail = all_lines[-lines:] if len(all_lines) > lines else all_lines
-    return "\n".join(tail)
+    return _tail(log_path, lines)
 
 
 # ─── Entry point ─────────────────────────────────────────────────────────────
 
+def _register(mcp) -> None:
+    """Register the module-level tool functions on a FastMCP server."""
+    for tool in (run_pipeline, list_reports, get_report, get_logs):
+        mcp.tool()(tool)
+
+
 def main() -> None:
+    # FastMCP pulls in a large import chain; only pay for it when serving.
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("stock-weekly-report")
+    _register(mcp)
     mcp.run()
 
 
@@ -21,42 +21,128 @@ bleeding into a new week's output.
 """
 
 import argparse
+import calendar
+import os
 import sys
 import time
 import traceback
-import yaml
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any, Iterator, Mapping, NamedTuple
 
 # Minimum acceptable audio file size.
 # A real podcast episode should be several MB; anything at or below this
 # is almost certainly a failed/partial download and must not be transcribed.
 MIN_AUDIO_BYTES = 512 * 1024  # 512 KB
 
-SUPPORTED_AUDIO_EXTS = {".mp3", ".m4a", ".ogg", ".aac", ".wav", ".flac", ".opus"}
+SUPPORTED_AUDIO_EXTS = frozenset({".mp3", ".m4a", ".ogg", ".aac", ".wav", ".flac", ".opus"})
+TRANSCRIPT_EXTS = frozenset({".txt"})
+REPORT_EXTS = frozenset({".txt", ".html", ".md"})
+
+# Threads used to fan out stat()/unlink() calls. These are latency-bound on
+# network mounts (where podcast audio often lives) and release the GIL.
+IO_WORKERS = 16
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def load_config(config_path: str) -> dict:
-    with open(config_path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+def load_config(config_path: str) -> Mapping[str, Any]:
+    # Shared with the CLI and MCP server so all of them hit the same cache.
+    # The result is frozen: every stage shares it read-only.
+    from config_manager import freeze_config, load_config as _load_config
+    return freeze_config(_load_config(config_path))
 
 
-def default_folder_name(lookback_days: int) -> str:
-    today = datetime.now(timezone.utc).date()
+@lru_cache(maxsize=8)
+def _folder_name(today_ordinal: int, lookback_days: int) -> str:
+    today = date.fromordinal(today_ordinal)
     start = today - timedelta(days=lookback_days)
-    return f"{start.strftime('%Y%m%d')}-{today.strftime('%Y%m%d')}"
+    return f"{start:%Y%m%d}-{today:%Y%m%d}"
+
+
+def default_folder_name(lookback_days: int) -> str:
+    return _folder_name(datetime.now(timezone.utc).toordinal(), lookback_days)
 
 
 def banner(title: str) -> None:
-    width = 60
-    print()
-    print("=" * width)
-    print(f"  {title}")
-    print("=" * width)
+    rule = "=" * 60
+    sys.stdout.write(f"\n{rule}\n  {title}\n{rule}\n")
+
+
+def _scan_files(directory: str | Path, extensions: frozenset[str]) -> list[os.DirEntry]:
+    """List regular files in *directory* whose suffix is in *extensions*.
+
+    One scandir pass replaces a glob per extension; the returned DirEntry
+    objects also spare a Path allocation per file. str.endswith() takes the
+    whole suffix tuple in one C-level call.
+    """
+    suffixes = tuple(extensions)
+    with os.scandir(directory) as it:
+        return [e for e in it if e.name.endswith(suffixes) and e.is_file()]
+
+
+def _iter_speaker_files(data_root: Path,
+                        extensions: frozenset[str]) -> Iterator[tuple[str, os.DirEntry]]:
+    """Yield (speaker, entry) for matching files in each subfolder of *data_root*.
+
+    Walks the two-level {speaker}/{file} layout with scandir only: folder
+    detection uses DirEntry.is_dir() instead of a stat() per Path. Order is
+    unspecified; callers that print sort the collected files once.
+    """
+    with os.scandir(data_root) as it:
+        speaker_dirs = [e for e in it if e.is_dir()]
+    for speaker_dir in speaker_dirs:
+        for f in _scan_files(speaker_dir.path, extensions):
+            yield speaker_dir.name, f
+
+
+class SpeakerFile(NamedTuple):
+    speaker: str
+    entry: os.DirEntry
+    date_str: str  # last '_'-separated token of the stem; unvalidated
+
+
+def _scan_speaker_files(data_root: Path, extensions: frozenset[str]) -> list[SpeakerFile]:
+    """Return a path-sorted manifest of the matching files under *data_root*.
+
+    The integrity guard and the audio retention sweep share one manifest per
+    run, so the audio tree is walked and its filenames split only once;
+    DirEntry caches stat(), so a size read by one is free for the other.
+    """
+    files = [
+        SpeakerFile(speaker, f, os.path.splitext(f.name)[0].split("_")[-1])
+        for speaker, f in _iter_speaker_files(data_root, extensions)
+    ]
+    files.sort(key=lambda sf: sf.entry.path)
+    return files
+
+
+def _scan_audio_manifest(audio_root: Path) -> list[SpeakerFile]:
+    if not audio_root.exists():
+        return []
+    return _scan_speaker_files(audio_root, SUPPORTED_AUDIO_EXTS)
+
+
+def _stat_sizes(entries: list[os.DirEntry]) -> list[int]:
+    """Return st_size for every entry, stat()ing them concurrently."""
+    if len(entries) < 2:
+        return [e.stat().st_size for e in entries]
+    with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(entries))) as pool:
+        return list(pool.map(lambda e: e.stat().st_size, entries))
+
+
+def _unlink_all(entries: list[os.DirEntry]) -> None:
+    """Delete every entry, issuing the unlink() calls concurrently."""
+    if len(entries) < 2:
+        for e in entries:
+            os.unlink(e.path)
+        return
+    with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(entries))) as pool:
+        list(pool.map(os.unlink, [e.path for e in entries]))
 
 
 def elapsed(start: float) -> str:
@@ -69,9 +155,19 @@ def elapsed(start: float) -> str:
 # Stage runners
 # ---------------------------------------------------------------------------
 
-def validate_audio_files(config: dict, folder_name: str) -> bool:
+def validate_audio_files(
+    config: dict,
+    folder_name: str,
+    known_sizes: dict[str, int] | None = None,
+    manifest: list[SpeakerFile] | None = None,
+) -> bool:
     """Check every downloaded audio file is intact before transcription.
 
+    known_sizes maps file paths to sizes already recorded by the fetch stage
+    as each download completed; only files missing from it are stat()ed here.
+    manifest is the run's audio manifest (see _scan_audio_manifest); it is
+    scanned here if not given, and deleted files are removed from it in place.
+
     Rules:
       - 0-byte files are deleted immediately (corrupt download) and counted as failures.
       - Files below MIN_AUDIO_BYTES are logged as warnings but kept — a very short
@@ -83,35 +179,40 @@ def validate_audio_files(config: dict, folder_name: str) -> bool:
     parts = folder_name.split("-")
     start_str, end_str = parts[0], parts[1]
 
-    audio_files = []
-    if audio_root.exists():
-        for speaker_dir in sorted(audio_root.iterdir()):
-            if not speaker_dir.is_dir():
-                continue
-            for ext in SUPPORTED_AUDIO_EXTS:
-                for f in speaker_dir.glob(f"*{ext}"):
-                    date_str = f.stem.split("_")[-1]
-                    if len(date_str) == 8 and start_str <= date_str <= end_str:
-                        audio_files.append(f)
-    audio_files = sorted(audio_files)
+    if manifest is None:
+        manifest = _scan_audio_manifest(audio_root)
+    audio_files = [
+        sf.entry for sf in manifest
+        if len(sf.date_str) == 8 and start_str <= sf.date_str <= end_str
+    ]
 
     if not audio_files:
         print(f"  ERROR: No audio files found in {audio_root}")
         return False
 
-    usable = 0
+    known_sizes = known_sizes or {}
+    unknown = [f for f in audio_files if f.path not in known_sizes]
+    sizes = dict(zip((f.path for f in unknown), _stat_sizes(unknown)))
+    sizes.update(known_sizes)
+
+    # Classify in one pass; corrupt files are deleted together afterwards.
+    corrupt: list[os.DirEntry] = []
+    lines = []
     for f in audio_files:
-        size = f.stat().st_size
-        size_mb = size / (1024 * 1024)
+        size = sizes[f.path]
         if size == 0:
-            print(f"  ✗ CORRUPT — deleting 0-byte file: {f.name}")
-            f.unlink()
+            corrupt.append(f)
+            lines.append(f"  ✗ CORRUPT — deleting 0-byte file: {f.name}")
         elif size < MIN_AUDIO_BYTES:
-            print(f"  ~ WARNING — suspiciously small ({size_mb:.2f} MB): {f.name}")
-            usable += 1
+            lines.append(f"  ~ WARNING — suspiciously small ({size / (1024 * 1024):.2f} MB): {f.name}")
         else:
-            print(f"  ✓ OK ({size_mb:.1f} MB): {f.name}")
-            usable += 1
+            lines.append(f"  ✓ OK ({size / (1024 * 1024):.1f} MB): {f.name}")
+    _unlink_all(corrupt)
+    if corrupt:
+        deleted = {f.path for f in corrupt}
+        manifest[:] = [sf for sf in manifest if sf.entry.path not in deleted]
+    usable = len(audio_files) - len(corrupt)
+    print("\n".join(lines))
 
     print()
     if usable == 0:
@@ -122,12 +223,23 @@ def validate_audio_files(config: dict, folder_name: str) -> bool:
     return True
 
 
-def run_fetch(config: dict, folder_name: str) -> bool:
+def run_fetch(
+    config: dict, folder_name: str, sizes: dict[str, int] | None = None
+) -> bool:
+    """Run the fetch stage; if sizes is given, record each finished download's size in it."""
     import fetch_episodes
     banner("STAGE 1 / 4 — Fetch & Download Episodes")
     t = time.time()
+
+    def record_size(dest: Path) -> None:
+        sizes[str(dest)] = os.stat(dest).st_size
+
     try:
-        fetch_episodes.fetch_and_download(config, folder_name=folder_name)
+        fetch_episodes.fetch_and_download(
+            config,
+            folder_name=folder_name,
+            on_file_complete=record_size if sizes is not None else None,
+        )
         print(f"\n[fetch] Done in {elapsed(t)}")
         return True
     except Exception:
@@ -191,19 +303,22 @@ def run_email(config: dict, folder_name: str, notebook_id: str,
         return False
 
 
-def _cutoff_date(months: int):
-    """Return a date `months` calendar months before today."""
-    today = datetime.now(timezone.utc).date()
-    cutoff_month = today.month - months
-    cutoff_year  = today.year
-    while cutoff_month <= 0:
-        cutoff_month += 12
-        cutoff_year  -= 1
-    return today.replace(year=cutoff_year, month=cutoff_month)
+def _cutoff_date(months: int, today: date | None = None) -> date:
+    """Return a date `months` calendar months before *today* (default: now, UTC).
+
+    The day is clamped to the target month's length, so e.g. 31 May minus
+    three months is 29 February rather than an invalid 31 February.
+    """
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+    year, month0 = divmod(today.year * 12 + today.month - 1 - months, 12)
+    month = month0 + 1
+    return date(year, month, min(today.day, calendar.monthrange(year, month)[1]))
 
 
 def _cleanup_data_dir(data_root: Path, label: str,
-                      extensions: set[str], months: int) -> None:
+                      extensions: frozenset[str], months: int,
+                      today: date | None = None) -> None:
     """Delete files matching `extensions` from week folders older than `months`."""
     if months <= 0:
         print(f"  {label}: retention = 0 (keep forever), skipping.")
@@ -215,37 +330,34 @@ def _cleanup_data_dir(data_root: Path, label: str,
         print(f"  Directory not found: {data_root}")
         return
 
-    cutoff = _cutoff_date(months)
+    cutoff = _cutoff_date(months, today)
+    cutoff_str = f"{cutoff:%Y%m%d}"
     print(f"  Cutoff date : {cutoff}  (keeping folders on or after this date)")
 
     removed_folders = 0
-    for week_dir in sorted(data_root.iterdir()):
-        if not week_dir.is_dir():
-            continue
-        parts = week_dir.name.split("-")
-        if len(parts) != 2 or len(parts[0]) != 8:
-            print(f"  Skipping unrecognised folder: {week_dir.name}")
-            continue
-        try:
-            folder_date = datetime.strptime(parts[0], "%Y%m%d").date()
-        except ValueError:
-            print(f"  Skipping unrecognised folder: {week_dir.name}")
+    lines = []
+    with os.scandir(data_root) as it:
+        week_dirs = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    for week_dir in week_dirs:
+        # Expect 'YYYYMMDD-YYYYMMDD'; checked in place, without split().
+        name = week_dir.name
+        if len(name) != 17 or name[8] != "-" or not name[:8].isdigit():
+            lines.append(f"  Skipping unrecognised folder: {name}")
             continue
 
-        if folder_date < cutoff:
-            files = []
-            for ext in extensions:
-                files.extend(week_dir.glob(f"*{ext}"))
+        if name[:8] < cutoff_str:
+            files = _scan_files(week_dir, extensions)
             if files:
-                total_mb = sum(f.stat().st_size for f in files) / (1024 * 1024)
-                print(f"  Deleting {len(files)} file(s) ({total_mb:.1f} MB) from {week_dir.name}")
-                for f in files:
-                    f.unlink()
+                total_mb = sum(_stat_sizes(files)) / (1024 * 1024)
+                lines.append(f"  Deleting {len(files)} file(s) ({total_mb:.1f} MB) from {week_dir.name}")
+                _unlink_all(files)
                 removed_folders += 1
             else:
-                print(f"  Already clean: {week_dir.name}")
+                lines.append(f"  Already clean: {week_dir.name}")
         else:
-            print(f"  Keeping : {week_dir.name}")
+            lines.append(f"  Keeping : {week_dir.name}")
+    if lines:
+        print("\n".join(lines))
 
     if removed_folders == 0:
         print("\n  No old files to remove.")
@@ -254,8 +366,13 @@ def _cleanup_data_dir(data_root: Path, label: str,
 
 
 def _cleanup_by_speaker(data_root: Path, label: str,
-                        extensions: set[str], months: int) -> None:
-    """Delete files matching `extensions` from per-speaker subdirs older than `months`."""
+                        extensions: frozenset[str], months: int,
+                        manifest: list[SpeakerFile] | None = None,
+                        today: date | None = None) -> None:
+    """Delete files matching `extensions` from per-speaker subdirs older than `months`.
+
+    If a manifest of *data_root* is given it is used instead of rescanning.
+    """
     if months <= 0:
         print(f"  {label}: retention = 0 (keep forever), skipping.")
         return
@@ -266,25 +383,27 @@ def _cleanup_by_speaker(data_root: Path, label: str,
         print(f"  Directory not found: {data_root}")
         return
 
-    cutoff = _cutoff_date(months)
+    cutoff = _cutoff_date(months, today)
+    # Fixed-width YYYYMMDD strings sort chronologically, so the per-file
+    # check is a plain string comparison with no date parsing.
+    cutoff_str = f"{cutoff:%Y%m%d}"
     print(f"  Cutoff date : {cutoff}  (deleting files published before this date)")
 
-    removed = 0
-    for speaker_dir in sorted(data_root.iterdir()):
-        if not speaker_dir.is_dir():
-            continue
-        for ext in extensions:
-            for f in speaker_dir.glob(f"*{ext}"):
-                date_str = f.stem.split("_")[-1]
-                try:
-                    file_date = datetime.strptime(date_str, "%Y%m%d").date()
-                except ValueError:
-                    continue
-                if file_date < cutoff:
-                    size_mb = f.stat().st_size / (1024 * 1024)
-                    print(f"  Deleting ({size_mb:.2f} MB): {speaker_dir.name}/{f.name}")
-                    f.unlink()
-                    removed += 1
+    if manifest is None:
+        manifest = _scan_speaker_files(data_root, extensions)
+    stale = [
+        sf for sf in manifest
+        if len(sf.date_str) == 8 and sf.date_str.isdigit() and sf.date_str < cutoff_str
+    ]
+
+    files = [sf.entry for sf in stale]
+    if files:
+        print("\n".join(
+            f"  Deleting ({size / (1024 * 1024):.2f} MB): {sf.speaker}/{sf.entry.name}"
+            for sf, size in zip(stale, _stat_sizes(files))
+        ))
+    _unlink_all(files)
+    removed = len(files)
 
     if removed == 0:
         print("  No old files to remove.")
@@ -292,30 +411,44 @@ def _cleanup_by_speaker(data_root: Path, label: str,
         print(f"  Removed {removed} file(s).")
 
 
-def _cleanup_audio_by_speaker(audio_root: Path, months: int) -> None:
-    _cleanup_by_speaker(audio_root, "Audio", SUPPORTED_AUDIO_EXTS, months)
+def _cleanup_audio_by_speaker(audio_root: Path, months: int,
+                              manifest: list[SpeakerFile] | None = None,
+                              today: date | None = None) -> None:
+    _cleanup_by_speaker(audio_root, "Audio", SUPPORTED_AUDIO_EXTS, months, manifest, today)
+
 
+def cleanup_old_data(config: dict,
+                     audio_manifest: list[SpeakerFile] | None = None) -> bool:
+    """Clean up old audio, transcript, and report files per retention config.
 
-def cleanup_old_data(config: dict) -> bool:
-    """Clean up old audio, transcript, and report files per retention config."""
+    audio_manifest, if given, is the manifest the integrity guard already
+    built this run; the audio sweep reuses it instead of rescanning.
+    """
     retention = config.get("retention", {})
     parent    = Path(config["parent_folder"])
+    # One "today" for all three sweeps, so a run that crosses midnight
+    # still applies consistent cutoffs.
+    today     = datetime.now(timezone.utc).date()
 
     _cleanup_audio_by_speaker(
         parent / "audio",
         int(retention.get("audio_months", 3)),
+        audio_manifest,
+        today,
     )
     _cleanup_by_speaker(
         parent / "transcripts",
         "Transcripts",
-        {".txt"},
+        TRANSCRIPT_EXTS,
         int(retention.get("transcripts_months", 0)),
+        today=today,
     )
     _cleanup_data_dir(
         parent / "reports",
         "Reports",
-        {".txt", ".html", ".md"},
+        REPORT_EXTS,
         int(retention.get("reports_months", 0)),
+        today,
     )
     return True
 
@@ -377,10 +510,15 @@ def main() -> None:
 
     results: dict[str, bool | str] = {}
     notebook_id: str | None = args.notebook_id
+    # Sizes of files downloaded this run, recorded as each download finishes,
+    # so the integrity guard does not stat them a second time.
+    fetched_sizes: dict[str, int] = {}
+    # Built by the integrity guard after fetch and reused by audio cleanup.
+    audio_manifest: list[SpeakerFile] | None = None
 
     # ── Stage 1: Fetch ──────────────────────────────────────────────
     if not args.skip_fetch:
-        ok = run_fetch(config, folder_name)
+        ok = run_fetch(config, folder_name, fetched_sizes)
         results["fetch"] = ok
         if not ok:
             print("\nPipeline aborted after fetch failure.")
@@ -391,7 +529,8 @@ def main() -> None:
 
     # ── Guard: Audio integrity ───────────────────────────────────────
     if not args.skip_transcribe:
-        ok = validate_audio_files(config, folder_name)
+        audio_manifest = _scan_audio_manifest(Path(config["parent_folder"]) / "audio")
+        ok = validate_audio_files(config, folder_name, fetched_sizes, audio_manifest)
         results["audio_check"] = ok
         if not ok:
             print("\nPipeline aborted: audio integrity check failed.")
@@ -436,7 +575,7 @@ def main() -> None:
 
     # ── Cleanup: Remove old audio / transcripts / reports ───────────
     if not args.skip_cleanup:
-        cleanup_old_data(config)
+        cleanup_old_data(config, audio_manifest)
         results["cleanup"] = True
     else:
         results["cleanup"] = "skipped"
@@ -449,6 +588,7 @@ def main() -> None:
 def _print_summary(results: dict, start: float) -> None:
     banner("Pipeline Summary")
     icons = {True: "✓", False: "✗", "skipped": "–", "partial": "~"}
+    lines = []
     for stage, status in results.items():
         icon = icons.get(status, "?")
         if status is True:
@@ -459,9 +599,9 @@ def _print_summary(results: dict, start: float) -> None:
             label = "partial (some files failed)"
         else:
             label = str(status)
-        print(f"  {icon}  {stage:<12} {label}")
-    print(f"\n  Total time: {elapsed(start)}")
-    print()
+        lines.append(f"  {icon}  {stage:<12} {label}")
+    lines.append(f"\n  Total time: {elapsed(start)}\n")
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -21,27 +21,53 @@ Usage (standalone):
 """
 
 import argparse
+import hashlib
 import json
 import os
 import smtplib
+import string
 import subprocess
 import sys
-import yaml
+import time
 import markdown as md
 from email.message import EmailMessage
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from functools import lru_cache
 from pathlib import Path
+from typing import Mapping
 
 # A meaningful weekly summary should comfortably exceed this.
 # If NotebookLM returns less, something went wrong and we should not send it.
 MIN_REPORT_CHARS = 5_000
 
+# Section queries are independent and wait on NotebookLM, not on this
+# machine, so they are issued in parallel (one per section by default).
+QUERY_WORKERS = 5
+
+# Section answers are cached in the run's report folder for this long, so
+# re-running the report step (e.g. to tweak the email) skips NotebookLM.
+SECTION_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# A one-line question asked before the section queries. NotebookLM that has
+# not indexed the sources yet fails it, answers with (next to) nothing, or
+# says it has no sources; the slow section queries are then never sent. A
+# real answer is one short sentence, so the length floor stays far below it.
+PROBE_QUESTION = "本週收錄了幾集 Podcast？請用一句話回答。"
+MIN_PROBE_CHARS = 5
+NO_SOURCES_MARKERS = ("no sources", "沒有來源", "沒有任何來源", "尚未新增來源")
+
+# Exit status of the standalone script when the notebook is not ready
+# (EX_TEMPFAIL), so a scheduler can tell "retry later" from a real failure.
+EXIT_NOT_READY = 75
+
+# Many providers reject envelopes with more RCPT TO commands than this.
+# Larger recipient lists are sent as several envelopes over one connection.
+RCPT_LIMIT = 100
+
 # ---------------------------------------------------------------------------
 # Report sections — each is queried independently so we are not limited
 # by a single response's length cap.
 # ---------------------------------------------------------------------------
-REPORT_SECTIONS = [
+REPORT_SECTIONS: tuple[tuple[str, str], ...] = (
     (
         "一、宏觀經濟與全球市場總覽",
         (
@@ -140,7 +166,10 @@ REPORT_SECTIONS = [
             "若同一支股票被多個節目提及，請分開列出各自的觀點。"
         ),
     ),
-]
+)
+
+# Markdown heading for each section, built once rather than per report.
+_SECTION_HEADINGS = tuple(f"## {title}\n\n" for title, _ in REPORT_SECTIONS)
 
 
 # ---------------------------------------------------------------------------
@@ -148,24 +177,31 @@ REPORT_SECTIONS = [
 # ---------------------------------------------------------------------------
 
 def load_config(config_path: str = "config.yaml") -> dict:
-    with open(config_path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    # Shared with the pipeline, CLI and MCP server: C loader + parse cache
+    from config_manager import load_config as _load_config
+    return _load_config(config_path)
 
 
 # ---------------------------------------------------------------------------
 # nlm helpers
 # ---------------------------------------------------------------------------
 
+class NotebookNotReadyError(RuntimeError):
+    """NotebookLM answered, but has not finished indexing the notebook's sources."""
+
+
 def _run_nlm(nlm_path: str, *args: str) -> subprocess.CompletedProcess:
+    """Run nlm and return the completed process; stdout is left as raw bytes."""
     cmd = [nlm_path, *args]
     print(f"  $ {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        stderr = result.stderr.strip() if result.stderr else ""
+    try:
+        return subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as exc:
+        # Callers handle RuntimeError; keep the stderr text in its message
+        stderr = exc.stderr.decode("utf-8", errors="replace").strip()
         raise RuntimeError(
-            f"nlm command failed (exit {result.returncode}): {stderr or '(no stderr)'}"
-        )
-    return result
+            f"nlm command failed (exit {exc.returncode}): {stderr or '(no stderr)'}"
+        ) from exc
 
 
 def create_briefing_doc(nlm_path: str, notebook_id: str, language: str = "zh-TW") -> None:
@@ -186,34 +222,112 @@ def create_briefing_doc(nlm_path: str, notebook_id: str, language: str = "zh-TW"
 
 def query_notebook(nlm_path: str, notebook_id: str, question: str) -> str:
     """Send a question to the notebook and return the text response."""
-    result = _run_nlm(nlm_path, "query", "notebook", notebook_id, question)
-    raw = result.stdout.strip()
-    # nlm returns a JSON envelope: {"value": {"answer": "...", ...}}
-    # Extract just the markdown answer text.
+    raw = _run_nlm(nlm_path, "query", "notebook", notebook_id, question).stdout
+    # nlm usually returns a JSON envelope: {"value": {"answer": "...", ...}}
+    # Extract just the markdown answer text. json.loads takes the bytes
+    # directly, so the envelope is never decoded and stripped as a whole.
+    # Plain-text output can't start with { or [, so skip the parser for it.
+    if raw.lstrip()[:1] in (b"{", b"["):
+        try:
+            data = json.loads(raw)
+            answer = data.get("value", {}).get("answer") or data.get("answer")
+            if answer:
+                return answer.strip()
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            pass
+    return raw.decode("utf-8", errors="replace").strip()
+
+
+def _section_cache_path(cache_dir: Path, notebook_id: str, idx: int, question: str) -> Path:
+    # Keyed by notebook and prompt text, so editing a prompt or switching
+    # notebooks never serves a stale answer. The .md suffix lets the reports
+    # retention sweep remove these with the rest of the week folder.
+    digest = hashlib.sha1(f"{notebook_id}\0{question}".encode("utf-8")).hexdigest()[:8]
+    return cache_dir / f".section_{idx}_{digest}.md"
+
+
+def _is_fresh(path: Path) -> bool:
     try:
-        data = json.loads(raw)
-        answer = (
-            data.get("value", {}).get("answer")
-            or data.get("answer")
-            or raw
+        return time.time() - path.stat().st_mtime < SECTION_CACHE_TTL
+    except OSError:
+        return False  # no cached answer yet
+
+
+def _query_section(nlm_path: str, notebook_id: str, idx: int, question: str,
+                   cache_dir: Path | None) -> tuple[str, bool]:
+    """Return (answer, from_cache) for one section, using a fresh cached answer if any."""
+    path = _section_cache_path(cache_dir, notebook_id, idx, question) if cache_dir else None
+    if path is not None and _is_fresh(path):
+        try:
+            return path.read_text(encoding="utf-8"), True
+        except OSError:
+            pass
+    answer = query_notebook(nlm_path, notebook_id, question)
+    # A thin answer usually means NotebookLM hasn't finished indexing the
+    # sources; don't pin it in the cache for the next attempt.
+    if path is not None and len(answer) >= MIN_REPORT_CHARS // len(REPORT_SECTIONS):
+        try:
+            path.write_text(answer, encoding="utf-8")
+        except OSError:
+            pass  # caching is best-effort
+    return answer, False
+
+
+def _check_probe(nlm_path: str, notebook_id: str) -> None:
+    """Ask PROBE_QUESTION; raise NotebookNotReadyError unless it gets a real answer."""
+    try:
+        answer = query_notebook(nlm_path, notebook_id, PROBE_QUESTION)
+    except RuntimeError as exc:
+        raise NotebookNotReadyError(f"NotebookLM probe query failed: {exc}") from exc
+    lowered = answer.lower()
+    if len(answer) < MIN_PROBE_CHARS or any(m in lowered for m in NO_SOURCES_MARKERS):
+        raise NotebookNotReadyError(
+            f"NotebookLM is not ready (probe answer: {answer!r}); the sources are "
+            "probably still being indexed. Try again later."
         )
-        return answer.strip()
-    except (json.JSONDecodeError, AttributeError):
-        return raw
 
 
-def query_all_sections(nlm_path: str, notebook_id: str) -> str:
-    """Run each report section query independently and combine into one document."""
+def query_all_sections(nlm_path: str, notebook_id: str,
+                       cache_dir: Path | None = None) -> str:
+    """Run each report section query independently and combine into one document.
+
+    The queries are independent and spend their time waiting on NotebookLM,
+    so they run concurrently; results are still assembled in section order.
+    If cache_dir is given, answers younger than SECTION_CACHE_TTL are reused
+    from it and new answers are saved there.
+
+    Unless every section is cached, a short probe query runs first and
+    NotebookNotReadyError is raised, before any section query is sent, if
+    it shows the notebook isn't ready.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    all_cached = cache_dir is not None and all(
+        _is_fresh(_section_cache_path(cache_dir, notebook_id, idx, question))
+        for idx, (_, question) in enumerate(REPORT_SECTIONS, start=1)
+    )
+    if not all_cached:
+        print("  Checking that the notebook is ready …")
+        _check_probe(nlm_path, notebook_id)
+
+    total = len(REPORT_SECTIONS)
     parts = []
-    for idx, (title, question) in enumerate(REPORT_SECTIONS, start=1):
-        print(f"  [{idx}/{len(REPORT_SECTIONS)}] Querying: {title} …")
-        try:
-            answer = query_notebook(nlm_path, notebook_id, question)
-        except RuntimeError as exc:
-            print(f"    WARNING: query failed — {exc}")
-            answer = "（此章節查詢失敗，請直接開啟 NotebookLM 筆記本查看。）"
-        parts.append(f"## {title}\n\n{answer}")
-        print(f"    → {len(answer):,} chars")
+    with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, total)) as pool:
+        futures = [
+            pool.submit(_query_section, nlm_path, notebook_id, idx, question, cache_dir)
+            for idx, (_, question) in enumerate(REPORT_SECTIONS, start=1)
+        ]
+        for idx, ((title, _), heading, future) in enumerate(
+            zip(REPORT_SECTIONS, _SECTION_HEADINGS, futures), start=1
+        ):
+            print(f"  [{idx}/{total}] {title} …")
+            try:
+                answer, cached = future.result()
+            except RuntimeError as exc:
+                print(f"    WARNING: query failed — {exc}")
+                answer, cached = "（此章節查詢失敗，請直接開啟 NotebookLM 筆記本查看。）", False
+            parts.append(heading + answer)
+            print(f"    → {len(answer):,} chars" + (" (cached)" if cached else ""))
     return "\n\n---\n\n".join(parts)
 
 
@@ -244,106 +358,114 @@ def build_email_body(folder_name: str, notebook_id: str, summary: str) -> str:
     return "\n".join(lines)
 
 
-def build_html_email(folder_name: str, notebook_id: str, summary: str) -> str:
-    """Render the summary markdown into a styled HTML email."""
-    notebook_url = f"https://notebooklm.google.com/notebook/{notebook_id}"
-    date_range = _format_date_range(folder_name)
-    content_html = md.markdown(summary, extensions=["extra", "tables"])
+@lru_cache(maxsize=1)
+def _markdown_converter() -> md.Markdown:
+    # Built once: loading the extensions is most of markdown's per-call setup.
+    return md.Markdown(extensions=["extra", "tables"])
 
-    return f"""<!DOCTYPE html>
+
+@lru_cache(maxsize=4)
+def _render_markdown(summary: str) -> str:
+    """Render report markdown to HTML; repeated renders of one summary are free."""
+    return _markdown_converter().reset().convert(summary)
+
+
+# Static email shell, parsed once at import. string.Template leaves the
+# CSS braces alone, so only the three ${...} fields are filled per email.
+_HTML_TEMPLATE = string.Template("""<!DOCTYPE html>
 <html lang="zh-TW">
 <head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <style>
-  body {{
+  body {
     font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Helvetica Neue",
                  Arial, "PingFang TC", "Microsoft JhengHei", sans-serif;
     background: #f4f6f9;
     margin: 0; padding: 0;
     color: #1a1a2e;
-  }}
-  .wrapper {{
+  }
+  .wrapper {
     max-width: 720px;
     margin: 32px auto;
     background: #ffffff;
     border-radius: 12px;
     overflow: hidden;
     box-shadow: 0 4px 24px rgba(0,0,0,0.08);
-  }}
-  .header {{
+  }
+  .header {
     background: linear-gradient(135deg, #1a1a2e 0%, #16213e 60%, #0f3460 100%);
     color: #ffffff;
     padding: 36px 40px 28px;
-  }}
-  .header h1 {{
+  }
+  .header h1 {
     margin: 0 0 6px;
     font-size: 24px;
     font-weight: 700;
     letter-spacing: 0.5px;
-  }}
-  .header .date {{
+  }
+  .header .date {
     font-size: 14px;
     opacity: 0.7;
     margin: 0;
-  }}
-  .content {{
+  }
+  .content {
     padding: 36px 40px;
     line-height: 1.8;
     font-size: 15px;
-  }}
-  .content h3 {{
+  }
+  .content h3 {
     font-size: 17px;
     font-weight: 700;
     color: #0f3460;
     border-left: 4px solid #e94560;
     padding-left: 12px;
     margin: 28px 0 14px;
-  }}
-  .content ul {{
+  }
+  .content ul {
     padding-left: 20px;
     margin: 8px 0 16px;
-  }}
-  .content li {{
+  }
+  .content li {
     margin-bottom: 8px;
-  }}
-  .content ul ul {{
+  }
+  .content ul ul {
     margin: 6px 0 6px;
-  }}
-  .content strong {{
+  }
+  .content strong {
     color: #0f3460;
-  }}
-  .content hr {{
+  }
+  .content hr {
     border: none;
     border-top: 1px solid #e8ecf0;
     margin: 28px 0;
-  }}
-  .content table {{
+  }
+  .content table {
     width: 100%;
     border-collapse: collapse;
     margin: 16px 0 24px;
     font-size: 14px;
-  }}
-  .content th {{
+  }
+  .content th {
     background: #0f3460;
     color: #ffffff;
     padding: 10px 14px;
     text-align: left;
     font-weight: 600;
-  }}
-  .content td {{
+  }
+  .content td {
     padding: 10px 14px;
     border-bottom: 1px solid #e8ecf0;
     vertical-align: top;
-  }}
-  .content tr:nth-child(even) td {{
+  }
+  .content tr:nth-child(even) td {
     background: #f8f9fc;
-  }}
-  .cta {{
+  }
+  .cta {
     margin: 32px 0 8px;
     text-align: center;
-  }}
-  .cta a {{
+  }
+  .cta a {
     display: inline-block;
     background: #e94560;
     color: #ffffff;
@@ -353,27 +475,27 @@ def build_html_email(folder_name: str, notebook_id: str, summary: str) -> str:
     font-weight: 600;
     font-size: 15px;
     letter-spacing: 0.3px;
-  }}
-  .footer {{
+  }
+  .footer {
     background: #f4f6f9;
     text-align: center;
     padding: 20px 40px;
     font-size: 12px;
     color: #999;
     border-top: 1px solid #e8ecf0;
-  }}
+  }
 </style>
 </head>
 <body>
   <div class="wrapper">
     <div class="header">
       <h1>📈 股市週報</h1>
-      <p class="date">{date_range}</p>
+      <p class="date">${date_range}</p>
     </div>
     <div class="content">
-      {content_html}
+      ${content_html}
       <div class="cta">
-        <a href="{notebook_url}">開啟 NotebookLM 筆記本 →</a>
+        <a href="${notebook_url}">開啟 NotebookLM 筆記本 →</a>
       </div>
     </div>
     <div class="footer">
@@ -381,46 +503,125 @@ def build_html_email(folder_name: str, notebook_id: str, summary: str) -> str:
     </div>
   </div>
 </body>
-</html>"""
+</html>""")
+
+
+def build_html_email(folder_name: str, notebook_id: str, summary: str) -> str:
+    """Render the summary markdown into a styled HTML email."""
+    notebook_url = f"https://notebooklm.google.com/notebook/{notebook_id}"
+    date_range = _format_date_range(folder_name)
+    content_html = _render_markdown(summary)
 
+    return _HTML_TEMPLATE.substitute(
+        date_range=date_range,
+        content_html=content_html,
+        notebook_url=notebook_url,
+    )
 
-def send_email(config: dict, subject: str, plain_body: str, html_body: str) -> None:
+
+class SMTPSession:
+    """An authenticated SMTP connection that is opened lazily and reused.
+
+    Every message sent through one session shares a single
+    connect/STARTTLS/login handshake; a NOOP before each reuse detects a
+    dropped connection and reconnects.
+    """
+
+    def __init__(self, email_cfg: Mapping) -> None:
+        if not email_cfg:
+            raise RuntimeError("No 'email' section found in config.yaml.")
+        self.host = email_cfg.get("smtp_host", "smtp.gmail.com")
+        self.port = int(email_cfg.get("smtp_port", 587))
+        self.user = email_cfg.get("smtp_user", email_cfg["from"])
+        # Prefer env var; fall back to config value (empty string → error)
+        self.password = os.environ.get("EMAIL_SMTP_PASSWORD") or email_cfg.get("smtp_password", "")
+        if not self.password:
+            raise RuntimeError(
+                "SMTP password not set.\n"
+                "  Export EMAIL_SMTP_PASSWORD=<your-app-password>\n"
+                "  or set smtp_password in config.yaml."
+            )
+        self._smtp: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port)
+        try:
+            smtp.ehlo()
+            smtp.starttls()
+            smtp.login(self.user, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        return smtp
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+            except (smtplib.SMTPException, OSError):
+                # Dropped, reset or otherwise unusable: start a fresh session
+                self._smtp.close()
+                self._smtp = None
+        if self._smtp is None:
+            self._smtp = self._connect()
+        return self._smtp
+
+    def send(self, msg: EmailMessage, from_addr: str, to_list: list[str]) -> None:
+        """Send *msg* as one envelope per RCPT_LIMIT recipients.
+
+        The message body is identical for everyone, so recipients share a
+        single DATA transfer rather than one send per address.
+        """
+        smtp = self._connection()
+        for i in range(0, len(to_list), RCPT_LIMIT):
+            smtp.send_message(msg, from_addr, to_list[i:i + RCPT_LIMIT])
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+    def __enter__(self) -> SMTPSession:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def send_email(config: dict, subject: str, plain_body: str, html_body: str,
+               session: SMTPSession | None = None) -> None:
+    """Send the report; reuses *session* if given, else opens a one-off one."""
     email_cfg = config.get("email", {})
     if not email_cfg:
         raise RuntimeError("No 'email' section found in config.yaml.")
 
     # Support email.to as either a string or a list of strings
     to_raw    = email_cfg["to"]
-    to_list   = to_raw if isinstance(to_raw, list) else [to_raw]
+    to_list   = list(to_raw) if isinstance(to_raw, (list, tuple)) else [to_raw]
     to_header = ", ".join(to_list)
-
     from_addr = email_cfg["from"]
-    smtp_host = email_cfg.get("smtp_host", "smtp.gmail.com")
-    smtp_port = int(email_cfg.get("smtp_port", 587))
-    smtp_user = email_cfg.get("smtp_user", from_addr)
 
-    # Prefer env var; fall back to config value (empty string → error)
-    smtp_password = os.environ.get("EMAIL_SMTP_PASSWORD") or email_cfg.get("smtp_password", "")
-    if not smtp_password:
-        raise RuntimeError(
-            "SMTP password not set.\n"
-            "  Export EMAIL_SMTP_PASSWORD=<your-app-password>\n"
-            "  or set smtp_password in config.yaml."
-        )
-
-    msg = MIMEMultipart("alternative")
+    # EmailMessage serialises straight to bytes in send_message(), without
+    # the str round-trip of MIMEMultipart.as_string().
+    msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"]    = from_addr
     msg["To"]      = to_header
-    msg.attach(MIMEText(plain_body, "plain", "utf-8"))
-    msg.attach(MIMEText(html_body,  "html",  "utf-8"))
-
-    print(f"  Sending to {to_header} via {smtp_host}:{smtp_port} …")
-    with smtplib.SMTP(smtp_host, smtp_port) as smtp:
-        smtp.ehlo()
-        smtp.starttls()
-        smtp.login(smtp_user, smtp_password)
-        smtp.sendmail(from_addr, to_list, msg.as_string())
+    msg.set_content(plain_body)
+    msg.add_alternative(html_body, subtype="html")
+
+    owned = session is None
+    if owned:
+        session = SMTPSession(email_cfg)
+    try:
+        print(f"  Sending to {to_header} via {session.host}:{session.port} …")
+        session.send(msg, from_addr, to_list)
+    finally:
+        if owned:
+            session.close()
     print("  Email sent.")
 
 
@@ -450,7 +651,8 @@ def save_report(config: dict, folder_name: str, body: str) -> Path:
     return report_path
 
 
-def run(config: dict, folder_name: str, notebook_id: str, send_email_flag: bool = True) -> None:
+def run(config: dict, folder_name: str, notebook_id: str, send_email_flag: bool = True,
+        use_cache: bool = True) -> None:
     nlm_path        = config.get("nlm_path", "nlm")
     notebook_prefix = config.get("notebooklm_notebook_prefix", "股市週報")
     date_range      = _format_date_range(folder_name)
@@ -461,7 +663,11 @@ def run(config: dict, folder_name: str, notebook_id: str, send_email_flag: bool
 
     # Step 2: Query the notebook section by section for a deep, detailed report
     print(f"\nQuerying notebook ({len(REPORT_SECTIONS)} sections) …")
-    summary = query_all_sections(nlm_path, notebook_id)
+    cache_dir = None
+    if use_cache:
+        cache_dir = Path(config["parent_folder"]) / "reports" / folder_name
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    summary = query_all_sections(nlm_path, notebook_id, cache_dir)
 
     if not summary:
         summary = (
@@ -485,7 +691,8 @@ def run(config: dict, folder_name: str, notebook_id: str, send_email_flag: bool
     # Step 5: Send the email (skipped when save_email_flag=False)
     if send_email_flag:
         print("\nSending email report …")
-        send_email(config, subject, plain_body, html_body)
+        with SMTPSession(config.get("email", {})) as session:
+            send_email(config, subject, plain_body, html_body, session)
     else:
         print("\nEmail sending skipped (save-report-only mode).")
 
@@ -504,12 +711,19 @@ def main() -> None:
                         help="NotebookLM notebook ID to query and report on.")
     parser.add_argument("--folder", default=None,
                         help="Run folder name, e.g. 20260218-20260225.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-query every section instead of reusing answers "
+                             "cached in the last 24 hours.")
     args = parser.parse_args()
 
     config      = load_config(args.config)
     folder_name = args.folder or "unknown"
 
-    run(config, folder_name, args.notebook_id)
+    try:
+        run(config, folder_name, args.notebook_id, use_cache=not args.no_cache)
+    except NotebookNotReadyError as exc:
+        print(f"\nERROR: {exc}", file=sys.stderr)
+        sys.exit(EXIT_NOT_READY)
 
 
 if __name__ == "__main__":
@@ -23,29 +23,60 @@ Output structure:
 """
 
 import argparse
+import os
 import sys
 import time
-import yaml
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 
-SUPPORTED_AUDIO_EXTS = {".mp3", ".m4a", ".ogg", ".aac", ".wav", ".flac", ".opus"}
+SUPPORTED_AUDIO_EXTS = frozenset({".mp3", ".m4a", ".ogg", ".aac", ".wav", ".flac", ".opus"})
 
 # Minimum character count for a transcript to be considered valid.
 # A podcast episode that produces fewer chars is almost certainly a failed run.
 MIN_TRANSCRIPT_CHARS = 50
+# verify_transcript() decides from this much of the file when it can; a
+# UTF-8 character is at most 4 bytes, so this holds well over the minimum.
+VERIFY_HEAD_BYTES = 4096
 
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds between retries
 
+# Files transcribed concurrently (config: whisper_workers). One model serves
+# all of them: CTranslate2 runs num_workers inferences in parallel and
+# releases the GIL, and the CPU threads are split between them so the
+# workers don't oversubscribe the cores. 1 keeps the classic serial run.
+DEFAULT_WHISPER_WORKERS = 1
+# whisper_workers: auto gives each CPU worker this many threads; beyond
+# about four, CTranslate2's intra-op threading stops paying off for Whisper.
+THREADS_PER_CPU_WORKER = 4
+
+# Greedy decoding without temperature fallback is the fast first attempt;
+# retries switch to RETRY_BEAM_SIZE with the fallback back on, so only the
+# episodes that actually failed pay for the slower, sturdier search.
+DEFAULT_BEAM_SIZE = 1
+RETRY_BEAM_SIZE = 5
+# Podcasts have long intro music and pauses; the encoder skips any gap of
+# at least this long instead of paying full cost for silent frames.
+VAD_MIN_SILENCE_MS = 500
+# Whisper's input rate; audio decoded ahead of time must match it.
+SAMPLE_RATE = 16000
+# Padding kept around each speech chunk (faster-whisper defaults to 400).
+VAD_SPEECH_PAD_MS = 200
+# On a GPU one episode's speech chunks are decoded this many at a time
+# unless whisper_batch_size says otherwise; a single chunk leaves most of
+# the device idle. Batching needs VAD, which supplies the chunk boundaries.
+DEFAULT_CUDA_BATCH_SIZE = 8
+
 
 # ---------------------------------------------------------------------------
 # Config & helpers
 # ---------------------------------------------------------------------------
 
 def load_config(config_path: str = "config.yaml") -> dict:
-    with open(config_path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    # Shared with the pipeline, CLI and MCP server: C loader + parse cache
+    from config_manager import load_config as _load_config
+    return _load_config(config_path)
 
 
 def default_folder_name(lookback_days: int) -> str:
@@ -54,6 +85,106 @@ def default_folder_name(lookback_days: int) -> str:
     return f"{start.strftime('%Y%m%d')}-{today.strftime('%Y%m%d')}"
 
 
+def resolve_device(config: dict) -> str:
+    """Return 'cuda' or 'cpu' for config['whisper_device'] (auto|cpu|cuda).
+
+    auto (the default) uses CUDA when CTranslate2 can see a GPU; the same
+    model runs an order of magnitude faster there than on the CPU.
+    """
+    device = str(config.get("whisper_device", "auto")).lower()
+    if device != "auto":
+        return device
+    try:
+        import ctranslate2
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except Exception:  # no ctranslate2 / no CUDA runtime
+        return "cpu"
+
+
+def resolve_compute_type(config: dict, device: str) -> str:
+    """Return the CTranslate2 compute type for config['whisper_compute_type'].
+
+    auto (the default) picks the fastest type the device supports:
+    int8_float16 on CUDA (int8 weights, half the VRAM of float16) and int8
+    on the CPU, falling back to float16 / float32 when unsupported. An
+    explicit value is passed through unchanged.
+    """
+    compute_type = str(config.get("whisper_compute_type") or "auto").lower()
+    if compute_type != "auto":
+        return compute_type
+    preferred = ("int8_float16", "float16") if device == "cuda" else ("int8", "float32")
+    try:
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types(device)
+    except Exception:  # no ctranslate2 / no CUDA runtime
+        return preferred[0]
+    return next((t for t in preferred if t in supported), "default")
+
+
+def physical_cores() -> int:
+    """Return the number of physical CPU cores (logical CPUs without psutil).
+
+    CTranslate2 defaults to one thread per logical CPU; on hyperthreaded
+    machines that puts two GEMM threads on each core and slows both down.
+    """
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+    except ImportError:
+        cores = None
+    return cores or os.cpu_count() or 1
+
+
+def resolve_workers(config: dict, device: str) -> int:
+    """Return the number of files to transcribe at once (config: whisper_workers).
+
+    auto runs one file per THREADS_PER_CPU_WORKER cores on the CPU, so a
+    many-core machine isn't left mostly idle; a GPU is already saturated
+    by one file (see whisper_batch_size), so auto means 1 there.
+    """
+    workers = config.get("whisper_workers", DEFAULT_WHISPER_WORKERS)
+    if str(workers).lower() == "auto":
+        if device != "cpu":
+            return 1
+        return max(1, physical_cores() // THREADS_PER_CPU_WORKER)
+    return max(1, int(workers))
+
+
+def transcribe_options(config: dict, device: str = "cpu") -> dict:
+    """Build model.transcribe() keyword arguments from config.
+
+    whisper_beam_size  beam width (default 1 = greedy, with temperature
+                       fallback off; larger widths keep the fallback)
+    whisper_vad        skip silence/music with the Silero VAD (default on)
+    whisper_condition_on_previous_text
+                       feed each window the previous text (default off:
+                       it is what sends Whisper into repetition loops on
+                       long Chinese episodes, which also inflate runtime)
+    whisper_batch_size batched inference chunk count; 0 = off (default:
+                       DEFAULT_CUDA_BATCH_SIZE on cuda with VAD on, else 0)
+    """
+    options: dict = {
+        "beam_size": int(config.get("whisper_beam_size", DEFAULT_BEAM_SIZE)),
+        "condition_on_previous_text": bool(
+            config.get("whisper_condition_on_previous_text", False)
+        ),
+    }
+    if options["beam_size"] == 1:
+        options["temperature"] = 0.0
+    vad = config.get("whisper_vad", True)
+    if vad:
+        options["vad_filter"] = True
+        options["vad_parameters"] = {
+            "min_silence_duration_ms": VAD_MIN_SILENCE_MS,
+            "speech_pad_ms": VAD_SPEECH_PAD_MS,
+        }
+    default_batch = DEFAULT_CUDA_BATCH_SIZE if device == "cuda" and vad else 0
+    batch_size = int(config.get("whisper_batch_size", default_batch))
+    if batch_size > 0:
+        options["batch_size"] = batch_size
+    return options
+
+
 def find_audio_files_for_run(audio_root: Path, folder_name: str) -> list[Path]:
     """Collect audio files across per-speaker subdirs whose date falls in the run window.
 
@@ -66,14 +197,18 @@ def find_audio_files_for_run(audio_root: Path, folder_name: str) -> list[Path]:
     files = []
     if not audio_root.exists():
         return files
-    for speaker_dir in sorted(audio_root.iterdir()):
-        if not speaker_dir.is_dir():
-            continue
-        for ext in SUPPORTED_AUDIO_EXTS:
-            for f in speaker_dir.glob(f"*{ext}"):
-                date_str = f.stem.split("_")[-1]
+    # One scandir pass per directory instead of a glob per extension
+    suffixes = tuple(SUPPORTED_AUDIO_EXTS)
+    with os.scandir(audio_root) as it:
+        speaker_dirs = [e.path for e in it if e.is_dir()]
+    for speaker_dir in speaker_dirs:
+        with os.scandir(speaker_dir) as it:
+            for e in it:
+                if not (e.name.endswith(suffixes) and e.is_file()):
+                    continue
+                date_str = os.path.splitext(e.name)[0].split("_")[-1]
                 if len(date_str) == 8 and start_str <= date_str <= end_str:
-                    files.append(f)
+                    files.append(Path(e.path))
     return sorted(files)
 
 
@@ -86,44 +221,158 @@ def verify_transcript(transcript_path: Path) -> tuple[bool, str]:
 
     Returns (ok, reason) where reason is an empty string on success.
     """
-    if not transcript_path.exists():
+    try:
+        size = transcript_path.stat().st_size
+    except FileNotFoundError:
         return False, "file missing"
-
-    size = transcript_path.stat().st_size
     if size == 0:
         return False, "file is empty (0 bytes)"
-
-    text = transcript_path.read_text(encoding="utf-8").strip()
+    if size < MIN_TRANSCRIPT_CHARS:  # every character takes at least a byte
+        return False, f"suspiciously short ({size} bytes < {MIN_TRANSCRIPT_CHARS} chars)"
+
+    # The stripped head of the file is a substring of the stripped whole, so
+    # enough text in the first few KB settles it without reading the rest.
+    with open(transcript_path, "rb") as f:
+        head = f.read(VERIFY_HEAD_BYTES)
+    if len(head.decode("utf-8", errors="ignore").strip()) >= MIN_TRANSCRIPT_CHARS:
+        return True, ""
+
+    if size > len(head):
+        text = transcript_path.read_text(encoding="utf-8").strip()
+    else:
+        text = head.decode("utf-8", errors="ignore").strip()
     if len(text) < MIN_TRANSCRIPT_CHARS:
         return False, f"suspiciously short ({len(text)} chars < {MIN_TRANSCRIPT_CHARS})"
 
     return True, ""
 
 
-def verify_all(audio_files: list[Path], transcript_root: Path) -> dict[str, tuple[bool, str]]:
-    """Verify every expected transcript and return a {filename: (ok, reason)} map."""
-    results = {}
-    for audio_file in audio_files:
-        stem = audio_file.stem
-        speaker = stem.rsplit("_", 1)[0]
-        transcript_path = transcript_root / speaker / f"{stem}.txt"
-        results[audio_file.name] = verify_transcript(transcript_path)
-    return results
+def _is_current(transcript_path: Path, audio_file: Path) -> bool:
+    """True if the transcript is newer than its audio and not undersized.
+
+    Transcripts only reach their final name after passing the length check
+    (see transcribe_with_retry), so one written after the audio was saved
+    is known good without reading it.
+    """
+    try:
+        st = transcript_path.stat()
+        return (st.st_size >= MIN_TRANSCRIPT_CHARS
+                and st.st_mtime >= audio_file.stat().st_mtime)
+    except OSError:
+        return False
 
 
 # ---------------------------------------------------------------------------
 # Single-file transcription with retry
 # ---------------------------------------------------------------------------
 
-def _do_transcribe(model, audio_file: Path, language: str) -> str:
-    """Run transcription and return the full text. Raises on error."""
+@lru_cache(maxsize=2)
+def _load_model(model_name: str, device: str, compute_type: str, **model_kwargs):
+    """Return a WhisperModel, reusing the one loaded by an earlier call.
+
+    Loading 'medium' reads ~800 MB of weights, so a long-lived process that
+    transcribes several run folders pays for it only once.
+
+    Named models are the pre-converted CTranslate2 checkpoints faster-whisper
+    fetches from the Hugging Face hub. Once they are in the local cache they
+    are loaded without contacting the hub; only a first run downloads.
+    """
+    # Import here so the script is importable without faster-whisper installed
+    from faster_whisper import WhisperModel
+    try:
+        model = WhisperModel(model_name, device=device, compute_type=compute_type,
+                             local_files_only=True, **model_kwargs)
+    except Exception:  # not cached yet (or a hub lookup is needed)
+        model = WhisperModel(model_name, device=device, compute_type=compute_type,
+                             **model_kwargs)
+    # cuBLAS/cuDNN are only loaded on first use, so on CUDA a warm-up failure
+    # is a real one and is raised here, where the caller can fall back to CPU
+    _warm_up(model, strict=device == "cuda")
+    return model
+
+
+def _model_kwargs(config: dict, device: str, workers: int) -> dict:
+    """Extra WhisperModel arguments for running *workers* files at once on *device*."""
+    kwargs = {}
+    if workers > 1:
+        kwargs["num_workers"] = workers
+    if device == "cpu":
+        # Threads per worker (config: whisper_cpu_threads); by default the
+        # physical cores are split between the workers
+        kwargs["cpu_threads"] = int(config.get("whisper_cpu_threads") or 0) or max(
+            1, physical_cores() // workers
+        )
+    return kwargs
+
+
+def _warm_up(model, strict: bool = False) -> None:
+    """Run one second of silence through the model.
+
+    The first transcribe() call pays for memory-pool setup and first-use
+    kernel initialisation; doing it here keeps that cost out of the first
+    episode's timing. VAD is off so the silence actually reaches the model.
+    Errors are ignored unless strict is set.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    try:
+        segments, _ = model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32),
+                                       language="en", beam_size=1, vad_filter=False)
+        for _ in segments:
+            pass
+    except Exception:
+        if strict:
+            raise
+        # otherwise only an optimisation; real transcription reports real errors
+
+
+def _decode_audio(path: Path):
+    """Decode *path* to Whisper's 16 kHz mono float32 samples, or None on error.
+
+    A failure here is not reported: transcribing from the path afterwards
+    hits the same problem and reports it through the normal retry path.
+    """
+    from faster_whisper import decode_audio
+    try:
+        return decode_audio(str(path), sampling_rate=SAMPLE_RATE)
+    except Exception:
+        return None
+
+
+def _do_transcribe(model, audio_file: Path, transcript_path: Path, language: str,
+                   options: dict | None = None, audio=None) -> int:
+    """Transcribe into transcript_path, writing segments as they are decoded.
+
+    Returns the total length of the stripped segments, a lower bound on
+    len(text.strip()) and so safe to check against MIN_TRANSCRIPT_CHARS.
+    Raises on error, possibly leaving a partial file behind.
+
+    options are extra keyword arguments for model.transcribe() (see
+    transcribe_options()). audio, if given, is audio_file already decoded
+    by _decode_audio() and is used instead of reading the file.
+    """
     segments, info = model.transcribe(
-        str(audio_file),
+        str(audio_file) if audio is None else audio,
         language=language,
-        beam_size=5,
+        **(options or {}),
     )
     print(f"  Detected language: {info.language} (prob {info.language_probability:.2f})")
-    return "".join(seg.text for seg in segments)
+    chars = 0
+    with open(transcript_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        for seg in segments:
+            f.write(seg.text)
+            chars += len(seg.text.strip())
+    return chars
+
+
+def _retry_options(options: dict | None) -> dict:
+    """Return *options* widened to RETRY_BEAM_SIZE with temperature fallback restored."""
+    options = dict(options or {})
+    options["beam_size"] = max(options.get("beam_size", 1), RETRY_BEAM_SIZE)
+    options.pop("temperature", None)
+    return options
 
 
 def transcribe_with_retry(
@@ -132,33 +381,43 @@ def transcribe_with_retry(
     transcript_path: Path,
     language: str,
     max_retries: int = MAX_RETRIES,
+    options: dict | None = None,
+    audio=None,
 ) -> bool:
     """Transcribe one file, retrying on failure or empty output.
 
-    Returns True on success, False if all attempts failed.
+    Returns True on success, False if all attempts failed. audio is the
+    optional pre-decoded input passed through to _do_transcribe().
+
+    Each attempt streams into a sibling .txt.tmp file that is renamed over
+    transcript_path only once it passes the length check, so a crash
+    mid-attempt never leaves a truncated transcript under the real name.
     """
+    tmp_path = transcript_path.with_suffix(".txt.tmp")
     for attempt in range(1, max_retries + 1):
         if attempt > 1:
             print(f"  Retry {attempt - 1}/{max_retries - 1} — waiting {RETRY_DELAY}s …")
             time.sleep(RETRY_DELAY)
-
-        # Remove any partial/corrupt file from a previous attempt
-        if transcript_path.exists():
-            transcript_path.unlink()
+            if attempt == 2:
+                options = _retry_options(options)
 
         try:
-            text = _do_transcribe(model, audio_file, language)
+            # "w" truncates any leftover from a previous attempt or run
+            chars = _do_transcribe(model, audio_file, tmp_path, language, options, audio)
         except Exception as exc:
             print(f"  Attempt {attempt} ERROR: {exc}")
             continue
 
-        if len(text.strip()) < MIN_TRANSCRIPT_CHARS:
-            print(f"  Attempt {attempt} produced too little text ({len(text.strip())} chars) — retrying")
+        if chars < MIN_TRANSCRIPT_CHARS:
+            print(f"  Attempt {attempt} produced too little text ({chars} chars) — retrying")
             continue
 
-        transcript_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, transcript_path)
         return True
 
+    # Don't leave a partial or too-short transcript behind for the next run
+    tmp_path.unlink(missing_ok=True)
+    transcript_path.unlink(missing_ok=True)
     return False
 
 
@@ -167,9 +426,6 @@ def transcribe_with_retry(
 # ---------------------------------------------------------------------------
 
 def transcribe_folder(config: dict, folder_name: str) -> None:
-    # Import here so the script is importable without faster-whisper installed
-    from faster_whisper import WhisperModel
-
     parent_folder = Path(config["parent_folder"])
     audio_root = parent_folder / "audio"
     transcript_root = parent_folder / "transcripts"
@@ -181,22 +437,55 @@ def transcribe_folder(config: dict, folder_name: str) -> None:
 
     model_name = config.get("whisper_model", "medium")
     language = config.get("whisper_language", "zh")
-    compute_type = config.get("whisper_compute_type", "int8")
+    device = resolve_device(config)
+    compute_type = resolve_compute_type(config, device)
+    workers = resolve_workers(config, device)
+    options = transcribe_options(config, device)
 
     print(f"Whisper model   : {model_name}  (faster-whisper / CTranslate2)")
+    print(f"Device          : {device}")
     print(f"Compute type    : {compute_type}")
     print(f"Language hint   : {language}")
+    print(f"Beam / VAD      : {options['beam_size']} / {'on' if options.get('vad_filter') else 'off'}"
+          + (f"  (batch {options['batch_size']})" if "batch_size" in options else ""))
     print(f"Audio root      : {audio_root}")
     print(f"Transcript root : {transcript_root}")
     print(f"Files to process: {len(audio_files)}")
     print(f"Max retries     : {MAX_RETRIES}")
+    print(f"Parallel files  : {workers}")
     print()
 
     print(f"Loading model '{model_name}' …")
-    model = WhisperModel(model_name, device="cpu", compute_type=compute_type)
+    try:
+        model = _load_model(model_name, device, compute_type,
+                            **_model_kwargs(config, device, workers))
+    except Exception as exc:
+        # A visible GPU doesn't mean a usable one (e.g. no cuDNN/cuBLAS);
+        # only an explicit whisper_device: cuda should fail the stage
+        if device != "cuda" or str(config.get("whisper_device", "auto")).lower() != "auto":
+            raise
+        print(f"  WARNING: could not load the model on CUDA ({exc}); falling back to CPU.")
+        device = "cpu"
+        compute_type = resolve_compute_type(config, device)
+        workers = resolve_workers(config, device)
+        options = transcribe_options(config, device)
+        print(f"  Device / compute type: {device} / {compute_type}")
+        model = _load_model(model_name, device, compute_type,
+                            **_model_kwargs(config, device, workers))
+    if "batch_size" in options:
+        try:
+            from faster_whisper import BatchedInferencePipeline
+            model = BatchedInferencePipeline(model=model)
+        except ImportError:  # faster-whisper < 1.1
+            print("  WARNING: whisper_batch_size needs faster-whisper >= 1.1; transcribing unbatched.")
+            del options["batch_size"]
     print("Model loaded.\n")
 
     succeeded, skipped, failed = [], [], []
+    pending: list[tuple[str, Path, Path]] = []
+    # Verification results gathered along the way, so the final pass does
+    # not re-read transcripts that were just checked or just written.
+    checked: dict[str, tuple[bool, str]] = {}
 
     for idx, audio_file in enumerate(audio_files, start=1):
         stem = audio_file.stem                          # e.g. "股癌_20260225"
@@ -208,29 +497,66 @@ def transcribe_folder(config: dict, folder_name: str) -> None:
 
         # Check if an existing transcript already passes verification
         if transcript_path.exists():
-            ok, reason = verify_transcript(transcript_path)
+            if _is_current(transcript_path, audio_file):
+                ok, reason = True, ""
+            else:
+                ok, reason = verify_transcript(transcript_path)
             if ok:
                 print(f"{label} SKIP (valid transcript exists): {audio_file.name}")
                 skipped.append(audio_file.name)
+                checked[audio_file.name] = (True, "")
                 continue
             else:
                 print(f"{label} Re-transcribing (existing transcript invalid — {reason}): {audio_file.name}")
 
-        print(f"{label} Transcribing: {audio_file.name} …")
-        ok = transcribe_with_retry(model, audio_file, transcript_path, language)
+        pending.append((label, audio_file, transcript_path))
 
-        if ok:
-            print(f"  Saved: {transcript_path}")
-            succeeded.append(audio_file.name)
-        else:
-            print(f"  FAILED after {MAX_RETRIES} attempt(s): {audio_file.name}")
-            failed.append(audio_file.name)
-        print()
+    def transcribe_one(job: tuple[str, Path, Path], audio=None) -> bool:
+        label, audio_file, transcript_path = job
+        print(f"{label} Transcribing: {audio_file.name} …")
+        return transcribe_with_retry(model, audio_file, transcript_path, language,
+                                     options=options, audio=audio)
+
+    def transcribe_serially(jobs: list[tuple[str, Path, Path]]):
+        # Decode the next file's audio (ffmpeg, outside the GIL) while the
+        # model works on this one, so decoding never sits between two runs
+        # of the model. At most two episodes' samples are held at once.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as decoder:
+            upcoming = decoder.submit(_decode_audio, jobs[0][1]) if jobs else None
+            for i, job in enumerate(jobs):
+                audio = upcoming.result()
+                upcoming = (decoder.submit(_decode_audio, jobs[i + 1][1])
+                            if i + 1 < len(jobs) else None)
+                yield transcribe_one(job, audio)
+                audio = None
+
+    pool = None
+    if workers > 1 and len(pending) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Results are reported in file order either way
+        outcomes = pool.map(transcribe_one, pending) if pool else transcribe_serially(pending)
+        for (label, audio_file, transcript_path), ok in zip(pending, outcomes):
+            if ok:
+                print(f"  Saved: {transcript_path}")
+                succeeded.append(audio_file.name)
+                # transcribe_with_retry only writes text that passed the length check
+                checked[audio_file.name] = (True, "")
+            else:
+                print(f"  FAILED after {MAX_RETRIES} attempt(s): {audio_file.name}")
+                failed.append(audio_file.name)
+                checked[audio_file.name] = verify_transcript(transcript_path)
+            print()
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     # ── Post-run verification ─────────────────────────────────────────────
     print("─" * 60)
     print("Verification pass …")
-    verification = verify_all(audio_files, transcript_root)
+    verification = {f.name: checked[f.name] for f in audio_files}
 
     all_ok = True
     for audio_name, (ok, reason) in verification.items():
@@ -21,17 +21,32 @@ Usage:
 
 import argparse
 import json
+import os
 import subprocess
 import sys
-import yaml
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+# orjson parses `nlm notebook list --json` several times faster when it is
+# installed; the stdlib parser is the fallback.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # A real podcast transcript should comfortably exceed this.
 # This is intentionally stricter than transcribe.py's MIN_TRANSCRIPT_CHARS (50),
 # which only guards against whisper crashes. Here we guard against uploading
 # near-empty files that would pollute the NotebookLM notebook.
 MIN_TRANSCRIPT_UPLOAD_CHARS = 500
+# A UTF-8 character is at most 4 bytes, so this much of a file's head holds
+# at least MIN_TRANSCRIPT_UPLOAD_CHARS characters when the file is long enough.
+CHECK_HEAD_BYTES = MIN_TRANSCRIPT_UPLOAD_CHARS * 4
+
+# Sources uploaded at once (config: nlm_parallel_uploads). Each upload
+# mostly waits for NotebookLM to process the file (--wait), so a few in
+# flight cut the stage's wall time roughly by that factor.
+DEFAULT_PARALLEL_UPLOADS = 4
 
 
 # ---------------------------------------------------------------------------
@@ -39,8 +54,9 @@ MIN_TRANSCRIPT_UPLOAD_CHARS = 500
 # ---------------------------------------------------------------------------
 
 def load_config(config_path: str = "config.yaml") -> dict:
-    with open(config_path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    # Shared with the pipeline, CLI and MCP server: C loader + parse cache
+    from config_manager import load_config as _load_config
+    return _load_config(config_path)
 
 
 def default_folder_name(lookback_days: int) -> str:
@@ -57,25 +73,60 @@ def find_transcripts_for_run(transcript_root: Path, folder_name: str) -> list[Pa
     files = []
     if not transcript_root.exists():
         return files
-    for speaker_dir in sorted(transcript_root.iterdir()):
-        if not speaker_dir.is_dir():
-            continue
-        for f in speaker_dir.glob("*.txt"):
-            date_str = f.stem.split("_")[-1]
-            if len(date_str) == 8 and start_str <= date_str <= end_str:
-                files.append(f)
+    # One scandir pass per directory; the date is cut from the name without
+    # building a Path for files outside the window
+    with os.scandir(transcript_root) as it:
+        speaker_dirs = [e.path for e in it if e.is_dir()]
+    for speaker_dir in speaker_dirs:
+        with os.scandir(speaker_dir) as it:
+            for e in it:
+                if not (e.name.endswith(".txt") and e.is_file()):
+                    continue
+                date_str = e.name[:-4].split("_")[-1]
+                if len(date_str) == 8 and start_str <= date_str <= end_str:
+                    files.append(Path(e.path))
     return sorted(files)
 
 
+def check_transcript_length(txt_file: Path) -> tuple[bool, str]:
+    """Return (long_enough, detail) for the upload sanity check.
+
+    Decides from the file size or its first CHECK_HEAD_BYTES where it can,
+    so full-length transcripts are never read in whole. detail is a
+    character count when the file was read to the end, else its size.
+    """
+    size = txt_file.stat().st_size
+    if size < MIN_TRANSCRIPT_UPLOAD_CHARS:  # fewer bytes than chars needed
+        return False, f"{size} bytes"
+    with open(txt_file, "rb") as f:
+        head = f.read(CHECK_HEAD_BYTES)
+    # The stripped head is a substring of the stripped file
+    if len(head.decode("utf-8", errors="ignore").strip()) >= MIN_TRANSCRIPT_UPLOAD_CHARS:
+        return True, f"{size:,} bytes"
+    text = txt_file.read_text(encoding="utf-8").strip() if size > len(head) else (
+        head.decode("utf-8", errors="ignore").strip()
+    )
+    return len(text) >= MIN_TRANSCRIPT_UPLOAD_CHARS, f"{len(text)} chars"
+
+
 # ---------------------------------------------------------------------------
 # nlm CLI wrappers
 # ---------------------------------------------------------------------------
 
-def _run_nlm(nlm_path: str, *args: str, capture: bool = True) -> subprocess.CompletedProcess:
-    """Run an nlm command and return the CompletedProcess result."""
+def _run_nlm(nlm_path: str, *args: str, capture: bool = True,
+             quiet: bool = False) -> subprocess.CompletedProcess:
+    """Run an nlm command and return the CompletedProcess result.
+
+    capture=False streams nlm's output to the terminal. quiet=True discards
+    stdout instead of buffering it; stderr is still kept for the error.
+    """
     cmd = [nlm_path, *args]
     print(f"  $ {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=capture, text=True)
+    if quiet:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True)
+    else:
+        result = subprocess.run(cmd, capture_output=capture, text=True)
     if result.returncode != 0:
         stderr = result.stderr.strip() if result.stderr else ""
         raise RuntimeError(
@@ -108,7 +159,7 @@ def list_notebooks(nlm_path: str) -> list[dict]:
     """Return all notebooks as a list of dicts (id, title, …)."""
     try:
         result = _run_nlm(nlm_path, "notebook", "list", "--json")
-        data = json.loads(result.stdout)
+        data = json_loads(result.stdout)
         # nlm may return a top-level list or {"notebooks": [...]}
         if isinstance(data, list):
             return data
@@ -120,9 +171,10 @@ def list_notebooks(nlm_path: str) -> list[dict]:
 
 def find_notebook_by_title(nlm_path: str, title: str) -> "str | None":
     """Return the ID of the first notebook whose title matches, or None."""
+    target = title.strip()
     for nb in list_notebooks(nlm_path):
         nb_title = nb.get("title") or nb.get("name") or ""
-        if nb_title.strip() == title.strip():
+        if nb_title.strip() == target:
             return nb.get("notebook_id") or nb.get("id")
     return None
 
@@ -146,15 +198,22 @@ def create_notebook(nlm_path: str, title: str) -> str:
     return notebook_id
 
 
-def add_source_file(nlm_path: str, notebook_id: str, file_path: Path) -> None:
-    """Upload a single transcript file to a NotebookLM notebook."""
+def add_source_file(nlm_path: str, notebook_id: str, file_path: Path,
+                    live: bool = True) -> None:
+    """Upload a single transcript file to a NotebookLM notebook.
+
+    With live=True nlm's progress output goes straight to the terminal;
+    concurrent uploads pass False so their output doesn't interleave. That
+    output is never read, so it is discarded rather than buffered.
+    """
     # --wait blocks until NotebookLM finishes processing the source
     _run_nlm(
         nlm_path,
         "source", "add", notebook_id,
         "--file", str(file_path),
         "--wait",
-        capture=False,  # stream live output so the user can see progress
+        capture=False,
+        quiet=not live,
     )
 
 
@@ -205,12 +264,12 @@ def run(config: dict, folder_name: str) -> str:
     print("Validating transcript contents …")
     valid_files, skipped_files = [], []
     for txt_file in txt_files:
-        char_count = len(txt_file.read_text(encoding="utf-8").strip())
-        if char_count < MIN_TRANSCRIPT_UPLOAD_CHARS:
-            print(f"  ~ SKIP — suspiciously short ({char_count} chars < {MIN_TRANSCRIPT_UPLOAD_CHARS}): {txt_file.name}")
+        ok, detail = check_transcript_length(txt_file)
+        if not ok:
+            print(f"  ~ SKIP — suspiciously short ({detail} < {MIN_TRANSCRIPT_UPLOAD_CHARS} chars): {txt_file.name}")
             skipped_files.append(txt_file.name)
         else:
-            print(f"  ✓ OK ({char_count} chars): {txt_file.name}")
+            print(f"  ✓ OK ({detail}): {txt_file.name}")
             valid_files.append(txt_file)
 
     if not valid_files:
@@ -225,15 +284,37 @@ def run(config: dict, folder_name: str) -> str:
 
     # --- Upload each transcript ---
     success, failed = 0, []
-
-    for idx, txt_file in enumerate(valid_files, start=1):
-        print(f"[{idx}/{len(valid_files)}] Uploading: {txt_file.name}")
-        try:
-            add_source_file(nlm_path, notebook_id, txt_file)
-            success += 1
-        except RuntimeError as exc:
-            print(f"  ERROR: {exc}")
-            failed.append(txt_file.name)
+    workers = min(max(1, int(config.get("nlm_parallel_uploads", DEFAULT_PARALLEL_UPLOADS))),
+                  len(valid_files))
+
+    if workers == 1:
+        for idx, txt_file in enumerate(valid_files, start=1):
+            print(f"[{idx}/{len(valid_files)}] Uploading: {txt_file.name}")
+            try:
+                add_source_file(nlm_path, notebook_id, txt_file)
+                success += 1
+            except RuntimeError as exc:
+                print(f"  ERROR: {exc}")
+                failed.append(txt_file.name)
+            print()
+    else:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        print(f"Uploading {len(valid_files)} file(s) ({workers} parallel) …")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(add_source_file, nlm_path, notebook_id, txt_file, False): txt_file
+                for txt_file in valid_files
+            }
+            for idx, future in enumerate(as_completed(futures), start=1):
+                txt_file = futures[future]
+                try:
+                    future.result()
+                    print(f"[{idx}/{len(valid_files)}] Uploaded: {txt_file.name}")
+                    success += 1
+                except RuntimeError as exc:
+                    print(f"[{idx}/{len(valid_files)}] ERROR uploading {txt_file.name}: {exc}")
+                    failed.append(txt_file.name)
         print()
 
     # --- Summary ---